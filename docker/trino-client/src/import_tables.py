@@ -1,7 +1,13 @@
 import argparse
+import posixpath
+import re
+import threading
+import time
+import fsspec
 import trino
 
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Set
 
 # Default attributes if none are supplied.
 from config import *
@@ -9,21 +15,88 @@ from config import *
 def create_schema_if_missing(cursor, schema: str):
     cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {TRINO_CATALOG}.{schema}")
 
-def register_table(trino_cursor, schema: str, table_name: str, table_path: str):
+# v12.metadata.json (Hadoop tables), 00012-<uuid>.metadata.json (catalog
+# commits), optionally gzip-compressed.
+METADATA_FILE_RE = re.compile(r"^v?(\d+)[.-].*metadata\.json(\.gz)?$")
+
+def latest_metadata_file(fs, table_path: str) -> str | None:
+    """
+    Name of the current metadata file in <table_path>/metadata/: the
+    version-hint.text target if present, otherwise the highest version.
+    """
+    metadata_dir = f"{table_path.rstrip('/')}/metadata"
+    names = [posixpath.basename(p.rstrip("/")) for p in fs.ls(metadata_dir, detail=False)]
+
+    versions = {}
+    for name in names:
+        m = METADATA_FILE_RE.match(name)
+        if m:
+            versions.setdefault(int(m.group(1)), name)
+    if not versions:
+        return None
+
+    if "version-hint.text" in names:
+        try:
+            hint = int(fs.cat_file(f"{metadata_dir}/version-hint.text").decode().strip())
+            if hint in versions:
+                return versions[hint]
+        except ValueError:
+            pass
+
+    return versions[max(versions)]
+
+def discover_metadata_files(base_path: str, tables: List[str], parallel: int = 8) -> Dict[str, str]:
+    """
+    {table: metadata file name}, listing every table's metadata/ directory
+    concurrently. Tables without a recognisable metadata file fall back to
+    v1.metadata.json.
+    """
+    fs, _ = fsspec.core.url_to_fs(base_path)
+
+    def find(table):
+        try:
+            return latest_metadata_file(fs, f"{base_path}/{table}")
+        except Exception as e:
+            print(f"[WARN] Could not list metadata for {table}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, parallel)) as pool:
+        found = dict(zip(tables, pool.map(find, tables)))
+
+    for table, name in found.items():
+        if name is None:
+            print(f"[WARN] No metadata file found for {table}, using v1.metadata.json")
+            found[table] = "v1.metadata.json"
+    return found
+
+def registered_tables(cursor, schema: str) -> Set[str]:
+    # One metadata query instead of a failing register_table call per table.
+    cursor.execute(
+        f"SELECT table_name FROM {TRINO_CATALOG}.information_schema.tables "
+        f"WHERE table_schema = '{schema}'"
+    )
+    return {row[0] for row in cursor.fetchall()}
+
+def register_table(trino_cursor, schema: str, table_name: str, table_path: str,
+                   metadata_file: str = "v1.metadata.json") -> bool:
     query = f"""
         CALL {TRINO_CATALOG}.system.register_table(
             schema_name => '{schema}',
             table_name => '{table_name}',
             table_location => '{table_path}',
-            metadata_file_name => 'v1.metadata.json'
+            metadata_file_name => '{metadata_file}'
         )
     """
     try:
-        print(f"Registering table: {table_name}")
+        print(f"Registering table: {table_name} ({metadata_file})")
         trino_cursor.execute(query)
+        # Drain so the CALL has completed before it is reported
+        trino_cursor.fetchall()
         print(f"Successfully registered: {table_name}")
+        return True
     except Exception as e:
         print(f"[ERROR] Failed to register {table_name}: {str(e)}")
+        return False
 
 def connect_trino(trino_host: str, schema: str):
     return trino.dbapi.connect(
@@ -36,20 +109,71 @@ def connect_trino(trino_host: str, schema: str):
         session_properties={"query_max_run_time": TIME_OUT},
     )
 
-def main(warehouse_path: str | None, schema: str, host: str, tables: List[str]):
+def register_tables_parallel(host: str, schema: str, jobs, parallel: int):
+    # Each worker thread registers over its own connection and cursor,
+    # closed once the pool is done.
+    local = threading.local()
+    opened = []
+
+    def run(job):
+        table, table_path, metadata_file = job
+        if not hasattr(local, "cursor"):
+            conn = connect_trino(host, schema)
+            local.cursor = conn.cursor()
+            opened.append((conn, local.cursor))
+        start = time.perf_counter()
+        ok = register_table(local.cursor, schema, table, table_path, metadata_file)
+        return table, ok, time.perf_counter() - start
+
+    try:
+        with ThreadPoolExecutor(max_workers=parallel) as pool:
+            return list(pool.map(run, jobs))
+    finally:
+        for conn, cursor in opened:
+            cursor.close()
+            conn.close()
+
+def main(warehouse_path: str | None, schema: str, host: str, tables: List[str], parallel: int = 1,
+         metadata_file: str | None = None):
     base_path = warehouse_path.rstrip("/")
     conn = connect_trino(host, schema)
     cursor = conn.cursor()
 
     create_schema_if_missing(cursor, schema)
 
-    print(f"Found {len(tables)} tables to register in Trino...")
-    for table in tables:
-        table_path = f"{base_path}/{table}"
-        register_table(cursor, schema, table, table_path)
+    existing = registered_tables(cursor, schema)
+    skipped = [table for table in tables if table.lower() in existing]
+    if skipped:
+        print(f"Already registered, skipping {len(skipped)} tables: {', '.join(skipped)}")
+    pending = [table for table in tables if table.lower() not in existing]
+
+    # Register the current snapshot of each table, not necessarily v1
+    if metadata_file is None:
+        metadata_files = discover_metadata_files(base_path, pending, max(parallel, 8))
+    else:
+        metadata_files = {table: metadata_file for table in pending}
+    jobs = [(table, f"{base_path}/{table}", metadata_files[table]) for table in pending]
+
+    print(f"Found {len(jobs)} tables to register in Trino...")
+    wall_start = time.perf_counter()
+    if parallel > 1:
+        results = register_tables_parallel(host, schema, jobs, parallel)
+    else:
+        results = []
+        for table, table_path, table_metadata_file in jobs:
+            start = time.perf_counter()
+            ok = register_table(cursor, schema, table, table_path, table_metadata_file)
+            results.append((table, ok, time.perf_counter() - start))
+    wall = time.perf_counter() - wall_start
 
     cursor.close()
     conn.close()
+
+    for table, ok, latency in results:
+        print(f"  {table:<28} {latency:8.2f}s  {'ok' if ok else 'FAILED'}")
+    failed = sum(1 for _, ok, _ in results if not ok)
+    print(f"Registered {len(results) - failed}/{len(results)} tables in {wall:.2f}s "
+          f"(sum of per-table latency {sum(r[2] for r in results):.2f}s, parallel={parallel})")
     print("Tables Imported!")
 
 if __name__ == "__main__":
@@ -58,5 +182,7 @@ if __name__ == "__main__":
     parser.add_argument('--host', required=True, help="Trino host (DNS or IP)")
     parser.add_argument("--tables", nargs="+", required=True, help="list of strings representing tables of schema")
     parser.add_argument('--warehouse', default=None, help="Base directory path to schema tables (e.g., s3://BUCKET/warehouse/SCHEMA/[TABLES])")
+    parser.add_argument('--parallel', type=int, default=1, help="Number of tables registered concurrently, each worker with its own connection")
+    parser.add_argument('--metadata_file', default=None, help="Register this metadata file for every table instead of discovering the latest one (e.g., v1.metadata.json)")
     args = parser.parse_args()
-    main(args.warehouse, args.schema, args.host, args.tables)
+    main(args.warehouse, args.schema, args.host, args.tables, max(1, args.parallel), args.metadata_file)
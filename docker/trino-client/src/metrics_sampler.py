@@ -0,0 +1,151 @@
+import re
+import threading
+import time
+from array import array
+from datetime import datetime
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import requests
+
+
+def parse_prometheus_text(text, name_filter=None):
+    """
+    Yield (metric name, label block, value) from a Prometheus text exposition,
+    e.g. the JMX exporter (:9090) or node_exporter (:9100) /metrics page.
+    The label block is kept verbatim ("{...}" or "").
+    """
+    for line in text.splitlines():
+        if not line or line[0] == "#":
+            continue
+
+        brace = line.find("{")
+        space = line.find(" ")
+        if brace != -1 and (space == -1 or brace < space):
+            close = line.rfind("}")
+            name, labels, rest = line[:brace], line[brace:close + 1], line[close + 1:]
+        else:
+            name, labels, rest = line[:space], "", line[space:]
+
+        if name_filter is not None and not name_filter.match(name):
+            continue
+        try:
+            yield name, labels, float(rest.split()[0])
+        except (IndexError, ValueError):
+            continue
+
+
+def parse_log_time(ts: str) -> datetime:
+    # start_time/end_time of a workload log, with or without fractional seconds
+    return datetime.fromisoformat(ts.replace("Z", "+00:00"))
+
+
+class MetricsSampler:
+    """
+    Background thread that scrapes Prometheus endpoints every `interval`
+    seconds while a workload pass runs.
+
+    Samples are kept as interned series ids plus float values and written as
+    one long Parquet table: ts, endpoint, metric, labels, value and the
+    ids of the queries running at ts (from the pass's start/end times).
+    """
+
+    def __init__(self, urls, interval=1.0, name_filter=None, timeout=5.0):
+        self.urls = list(urls)
+        self.interval = interval
+        self.name_filter = re.compile(name_filter) if name_filter else None
+        self.timeout = timeout
+
+        self._stop = threading.Event()
+        self._thread = None
+        self._reset()
+
+    def _reset(self):
+        self.series = {}                 # (endpoint, metric, labels) -> series id
+        self.scrape_ts = array("d")      # epoch seconds per scrape
+        self.row_scrape = array("i")     # scrape index per sample
+        self.row_series = array("i")     # series id per sample
+        self.row_value = array("d")
+        self.errors = 0
+
+    def start(self):
+        self._reset()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.errors:
+            print(f"[metrics] {self.errors} scrape(s) failed")
+
+    def _run(self):
+        session = requests.Session()
+        next_tick = time.perf_counter()
+        while not self._stop.is_set():
+            self.scrape(session)
+            # Fixed-rate schedule; skip ticks if a scrape overran
+            next_tick += self.interval
+            now = time.perf_counter()
+            if next_tick < now:
+                next_tick = now
+            self._stop.wait(next_tick - now)
+        session.close()
+
+    def scrape(self, session):
+        scrape_idx = len(self.scrape_ts)
+        self.scrape_ts.append(time.time())
+
+        for endpoint in self.urls:
+            try:
+                r = session.get(endpoint, timeout=self.timeout)
+                r.raise_for_status()
+            except Exception:
+                self.errors += 1
+                continue
+
+            for name, labels, value in parse_prometheus_text(r.text, self.name_filter):
+                key = (endpoint, name, labels)
+                sid = self.series.get(key)
+                if sid is None:
+                    sid = self.series[key] = len(self.series)
+                self.row_scrape.append(scrape_idx)
+                self.row_series.append(sid)
+                self.row_value.append(value)
+
+    def to_table(self, results=()):
+        """
+        Arrow table of the collected samples. `results` are the workload log
+        rows of the pass; their start/end times fill the `queries` column.
+        """
+        scrape_ts = np.frombuffer(self.scrape_ts, dtype=np.float64)
+        row_scrape = np.frombuffer(self.row_scrape, dtype=np.int32)
+        row_series = np.frombuffer(self.row_series, dtype=np.int32)
+
+        # Queries running at each scrape, as one string per scrape
+        intervals = [
+            (r["query_id"], parse_log_time(r["start_time"]).timestamp(), parse_log_time(r["end_time"]).timestamp())
+            for r in results
+            if isinstance(r.get("start_time"), str) and isinstance(r.get("end_time"), str)
+        ]
+        active = [
+            ",".join(qid for qid, s, e in intervals if s <= ts <= e)
+            for ts in scrape_ts
+        ]
+
+        keys = list(self.series)
+        return pa.table({
+            "ts": pa.array((scrape_ts[row_scrape] * 1e6).astype(np.int64), pa.timestamp("us", tz="UTC")),
+            "endpoint": pa.DictionaryArray.from_arrays(row_series, pa.array([k[0] for k in keys], pa.string())),
+            "metric": pa.DictionaryArray.from_arrays(row_series, pa.array([k[1] for k in keys], pa.string())),
+            "labels": pa.DictionaryArray.from_arrays(row_series, pa.array([k[2] for k in keys], pa.string())),
+            "value": pa.array(np.frombuffer(self.row_value, dtype=np.float64)),
+            "queries": pa.DictionaryArray.from_arrays(row_scrape, pa.array(active, pa.string())),
+        })
+
+    def write(self, path, results=()):
+        pq.write_table(self.to_table(results), path, compression="zstd")
@@ -0,0 +1,221 @@
+import re
+import threading
+import time
+import uuid
+
+import fsspec
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+_DURATION_UNITS = {"ns": 1e-9, "us": 1e-6, "µs": 1e-6, "ms": 1e-3, "s": 1.0, "m": 60.0, "h": 3600.0, "d": 86400.0}
+_SIZE_UNITS = {"B": 1, "kB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30, "TB": 1 << 40, "PB": 1 << 50}
+_VALUE_RE = re.compile(r"^\s*([0-9]+(?:\.[0-9]+)?)\s*([a-zA-Zµ]*)\s*$")
+
+
+def duration_to_seconds(d):
+    # Trino duration ("1.23s", "12.50ms", "2.00m", ...) in seconds, as dur_to_s in
+    # make_lakehouse_workload_logs.sh; None if absent or unparseable.
+    if d is None:
+        return None
+    if isinstance(d, (int, float)):
+        return float(d)
+    m = _VALUE_RE.match(str(d))
+    if not m or (m.group(2) or "s") not in _DURATION_UNITS:
+        return None
+    return float(m.group(1)) * _DURATION_UNITS[m.group(2) or "s"]
+
+
+def data_size_to_bytes(d):
+    # Trino DataSize ("1.23MB", "512B", or plain bytes) in bytes.
+    if d is None:
+        return None
+    if isinstance(d, (int, float)):
+        return int(d)
+    m = _VALUE_RE.match(str(d))
+    if not m or (m.group(2) or "B") not in _SIZE_UNITS:
+        return None
+    return int(round(float(m.group(1)) * _SIZE_UNITS[m.group(2) or "B"]))
+
+
+QUERY_SCHEMA = pa.schema([
+    ("query_id", pa.string()),
+    ("trino_query_id", pa.string()),
+    ("state", pa.string()),
+    ("elapsed_s", pa.float64()),
+    ("queued_s", pa.float64()),
+    ("analysis_s", pa.float64()),
+    ("planning_s", pa.float64()),
+    ("execution_s", pa.float64()),
+    ("resource_waiting_s", pa.float64()),
+    ("cpu_s", pa.float64()),
+    ("scheduled_s", pa.float64()),
+    ("blocked_s", pa.float64()),
+    ("physical_input_bytes", pa.int64()),
+    ("physical_input_rows", pa.int64()),
+    ("processed_input_bytes", pa.int64()),
+    ("processed_input_rows", pa.int64()),
+    ("output_bytes", pa.int64()),
+    ("output_rows", pa.int64()),
+    ("spilled_bytes", pa.int64()),
+    ("peak_user_memory_bytes", pa.int64()),
+    ("peak_total_memory_bytes", pa.int64()),
+])
+
+OPERATOR_SCHEMA = pa.schema([
+    ("query_id", pa.string()),
+    ("stage_id", pa.int32()),
+    ("pipeline_id", pa.int32()),
+    ("operator_id", pa.int32()),
+    ("plan_node_id", pa.string()),
+    ("operator_type", pa.string()),
+    ("drivers", pa.int64()),
+    ("cpu_s", pa.float64()),
+    ("wall_s", pa.float64()),
+    ("blocked_s", pa.float64()),
+    ("input_bytes", pa.int64()),
+    ("input_rows", pa.int64()),
+    ("physical_input_bytes", pa.int64()),
+    ("output_bytes", pa.int64()),
+    ("output_rows", pa.int64()),
+    ("spilled_bytes", pa.int64()),
+])
+
+
+def _sum_durations(stats, keys):
+    values = [duration_to_seconds(stats.get(k)) for k in keys]
+    values = [v for v in values if v is not None]
+    return sum(values) if values else None
+
+
+def extract_query_stats(doc, query_id):
+    """
+    One row of query-level stats from a /ui/api/query/{id} document.
+    """
+    qs = doc.get("queryStats") or {}
+    return {
+        "query_id": query_id,
+        "trino_query_id": doc.get("queryId"),
+        "state": doc.get("state"),
+        "elapsed_s": duration_to_seconds(qs.get("elapsedTime")),
+        "queued_s": duration_to_seconds(qs.get("queuedTime")),
+        "analysis_s": duration_to_seconds(qs.get("analysisTime")),
+        "planning_s": duration_to_seconds(qs.get("planningTime")),
+        "execution_s": duration_to_seconds(qs.get("executionTime")),
+        "resource_waiting_s": duration_to_seconds(qs.get("resourceWaitingTime")),
+        "cpu_s": duration_to_seconds(qs.get("totalCpuTime")),
+        "scheduled_s": duration_to_seconds(qs.get("totalScheduledTime")),
+        "blocked_s": duration_to_seconds(qs.get("totalBlockedTime")),
+        "physical_input_bytes": data_size_to_bytes(qs.get("physicalInputDataSize")),
+        "physical_input_rows": qs.get("physicalInputPositions"),
+        "processed_input_bytes": data_size_to_bytes(qs.get("processedInputDataSize")),
+        "processed_input_rows": qs.get("processedInputPositions"),
+        "output_bytes": data_size_to_bytes(qs.get("outputDataSize")),
+        "output_rows": qs.get("outputPositions"),
+        "spilled_bytes": data_size_to_bytes(qs.get("spilledDataSize")),
+        "peak_user_memory_bytes": data_size_to_bytes(qs.get("peakUserMemoryReservation")),
+        "peak_total_memory_bytes": data_size_to_bytes(qs.get("peakTotalMemoryReservation")),
+    }
+
+
+def extract_operator_stats(doc, query_id):
+    """
+    One row per operator summary (stage, pipeline, operator); per-stage
+    totals are a group-by on stage_id.
+    """
+    rows = []
+    for op in (doc.get("queryStats") or {}).get("operatorSummaries") or []:
+        rows.append({
+            "query_id": query_id,
+            "stage_id": op.get("stageId"),
+            "pipeline_id": op.get("pipelineId"),
+            "operator_id": op.get("operatorId"),
+            "plan_node_id": op.get("planNodeId"),
+            "operator_type": op.get("operatorType"),
+            "drivers": op.get("totalDrivers"),
+            "cpu_s": _sum_durations(op, ("addInputCpu", "getOutputCpu", "finishCpu")),
+            "wall_s": _sum_durations(op, ("addInputWall", "getOutputWall", "finishWall")),
+            "blocked_s": duration_to_seconds(op.get("blockedWall")),
+            "input_bytes": data_size_to_bytes(op.get("inputDataSize")),
+            "input_rows": op.get("inputPositions"),
+            "physical_input_bytes": data_size_to_bytes(op.get("physicalInputDataSize")),
+            "output_bytes": data_size_to_bytes(op.get("outputDataSize")),
+            "output_rows": op.get("outputPositions"),
+            "spilled_bytes": data_size_to_bytes(op.get("spilledDataSize")),
+        })
+    return rows
+
+
+class PlanStatsWriter:
+    """
+    Collects query and operator stats at capture time and appends them to
+    two Hive-partitioned Parquet datasets under the results prefix:
+
+      <prefix>/plan_stats/queries/run=<run>/attempt=<n>/part-<uuid>.parquet
+      <prefix>/plan_stats/operators/run=<run>/attempt=<n>/part-<uuid>.parquet
+
+    add() is thread-safe; flush() writes one new part file per partition and
+    table, so resumed or repeated runs append rather than overwrite.
+    maybe_flush() flushes once `flush_rows` queries are buffered or
+    `flush_interval` seconds have passed since the last flush, so a killed
+    run loses at most that much.
+    """
+
+    def __init__(self, results_prefix, flush_rows=256, flush_interval=30.0):
+        self.results_prefix = results_prefix.rstrip("/")
+        self.fs, _ = fsspec.core.url_to_fs(self.results_prefix)
+        self.local = "file" in self.fs.protocol
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._queries = {}      # (run, attempt) -> [row, ...]
+        self._operators = {}
+        self._buffered = 0      # query rows since the last flush
+        self._last_flush = time.monotonic()
+
+    def add(self, run_name, attempt, query_id, doc):
+        query_row = extract_query_stats(doc, query_id)
+        operator_rows = extract_operator_stats(doc, query_id)
+        with self._lock:
+            self._queries.setdefault((run_name, attempt), []).append(query_row)
+            self._operators.setdefault((run_name, attempt), []).extend(operator_rows)
+            self._buffered += 1
+
+    def maybe_flush(self):
+        # True if a flush was due and has been written
+        with self._lock:
+            if not self._buffered or (
+                self._buffered < self.flush_rows
+                and time.monotonic() - self._last_flush < self.flush_interval
+            ):
+                return False
+            batches = self._take()
+        self._write_all(*batches)
+        return True
+
+    def flush(self):
+        with self._lock:
+            batches = self._take()
+        self._write_all(*batches)
+
+    def _take(self):
+        # Caller holds the lock
+        queries, self._queries = self._queries, {}
+        operators, self._operators = self._operators, {}
+        self._buffered = 0
+        self._last_flush = time.monotonic()
+        return queries, operators
+
+    def _write_all(self, queries, operators):
+        for (run_name, attempt), rows in queries.items():
+            self._write("queries", QUERY_SCHEMA, run_name, attempt, rows)
+        for (run_name, attempt), rows in operators.items():
+            self._write("operators", OPERATOR_SCHEMA, run_name, attempt, rows)
+
+    def _write(self, table, schema, run_name, attempt, rows):
+        if not rows:
+            return
+        directory = f"{self.results_prefix}/plan_stats/{table}/run={run_name}/attempt={attempt}"
+        if self.local:
+            self.fs.makedirs(directory, exist_ok=True)
+        with self.fs.open(f"{directory}/part-{uuid.uuid4().hex}.parquet", "wb") as f:
+            pq.write_table(pa.Table.from_pylist(rows, schema=schema), f, compression="zstd")
@@ -5,6 +5,8 @@ TRINO_HOST="${1:?missing TRINO_HOST}"
 WAREHOUSE_PATH="${2:?missing WAREHOUSE_PATH}"
 SCHEMA="${3:-tpcds}"
 TABLES_ARG="${4:-}"
+# Tables registered concurrently (one Trino connection per worker)
+PARALLEL="${REGISTER_PARALLEL:-8}"
 
 SCRIPT="python3 /src/import_tables.py"
 
@@ -39,5 +41,5 @@ if [[ -n "$TABLES_ARG" ]]; then
   IFS=',' read -r -a TABLES <<< "$TABLES_ARG"
 fi
 
-echo "[INFO] Registering schema=$SCHEMA with ${#TABLES[@]} tables"
-$SCRIPT --host "$TRINO_HOST" --warehouse "$WAREHOUSE_PATH" --schema "$SCHEMA" --tables "${TABLES[@]}"
+echo "[INFO] Registering schema=$SCHEMA with ${#TABLES[@]} tables (parallel=$PARALLEL)"
+$SCRIPT --host "$TRINO_HOST" --warehouse "$WAREHOUSE_PATH" --schema "$SCHEMA" --parallel "$PARALLEL" --tables "${TABLES[@]}"
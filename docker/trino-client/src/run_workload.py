@@ -1,6 +1,13 @@
 import argparse
+import asyncio
 import json
+import os
+import queue
+import random
+import shutil
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timezone
 
@@ -10,6 +17,8 @@ import fsspec
 
 # Default attributes if none are supplied.
 from config import *
+from metrics_sampler import MetricsSampler, parse_log_time
+from plan_stats import PlanStatsWriter
 
 def join_url(prefix: str, *parts: str) -> str:
     prefix = prefix.rstrip("/")
@@ -23,53 +32,370 @@ def upload_file(local_path: str, remote_url: str) -> None:
         for chunk in iter(lambda: fin.read(1024 * 1024), b""):
             fout.write(chunk)
 
+def read_remote_lines(remote_url: str):
+    # Lines of a remote text file via fsspec; [] if it does not exist.
+    try:
+        with fsspec.open(remote_url, "r") as fin:
+            return fin.read().splitlines()
+    except FileNotFoundError:
+        return []
+
+class TraceUploader:
+    """
+    Background pipeline that scrapes query info JSON from the Trino UI API and
+    uploads it to object storage, off the measured query loop.
+
+    Query ids go through a bounded queue to `workers` threads. Each thread
+    keeps its own pooled requests.Session, takes up to `batch_size` queued
+    queries at a time and writes their compact JSON in one fs.pipe() call.
+    With a PlanStatsWriter, the stats used downstream are also extracted at
+    capture time and written out whenever the writer's maybe_flush() is due
+    after a batch; `raw_json=False` then skips the raw documents entirely.
+    close() drains the queue and waits for every upload.
+    """
+
+    def __init__(self, trino_host, trino_port, info_headers, results_prefix,
+                 workers=2, batch_size=16, max_pending=256, plan_stats=None, raw_json=True):
+        self.base_url = f"http://{trino_host}:{trino_port}/ui/api/query"
+        self.info_headers = info_headers
+        self.results_prefix = results_prefix
+        self.batch_size = batch_size
+        self.plan_stats = plan_stats
+        self.raw_json = raw_json
+        self.fs, _ = fsspec.core.url_to_fs(results_prefix)
+        self.local = "file" in self.fs.protocol
+        self.pending = queue.Queue(maxsize=max_pending)
+        self.failed = 0
+        self._lock = threading.Lock()
+        self._threads = [threading.Thread(target=self._worker, daemon=True) for _ in range(workers)]
+        for t in self._threads:
+            t.start()
+
+    def submit(self, trino_query_id, query_id, run_name, attempt):
+        # Blocks only if `max_pending` uploads are already queued.
+        self.pending.put((trino_query_id, query_id, run_name, attempt))
+
+    def flush(self):
+        # Wait until every submitted document has been uploaded (or failed).
+        self.pending.join()
+        self._flush_plan_stats()
+
+    def close(self):
+        for _ in self._threads:
+            self.pending.put(None)
+        for t in self._threads:
+            t.join()
+        self._flush_plan_stats()
+        if self.failed:
+            print(f"[uploader] {self.failed} query info document(s) could not be uploaded")
+
+    def _worker(self):
+        # Keep-alive connections to the coordinator are reused across scrapes
+        session = requests.Session()
+
+        done = False
+        while not done:
+            # One blocking get, then whatever else is already queued;
+            # a sentinel ends this worker after the current batch.
+            batch = []
+            item = self.pending.get()
+            while True:
+                if item is None:
+                    done = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self.pending.get_nowait()
+                except queue.Empty:
+                    break
+
+            files = {}
+            for trino_query_id, query_id, run_name, attempt in batch:
+                try:
+                    r = session.get(f"{self.base_url}/{trino_query_id}", headers=self.info_headers, timeout=30)
+                    if not r.ok:
+                        raise RuntimeError(f"HTTP {r.status_code}")
+                    doc = r.json()
+                    if self.plan_stats is not None:
+                        self.plan_stats.add(run_name, attempt, query_id, doc)
+                    if self.raw_json:
+                        doc["metrics"] = {}
+                        remote = join_url(self.results_prefix, run_name, f"lakehouse_run_{attempt}", f"{query_id}.json")
+                        files[remote] = json.dumps(doc, separators=(",", ":")).encode()
+                except Exception as e:
+                    print(f"[{query_id}] Query info scrape failed: {e}")
+                    self._record_failures(1)
+
+            if files:
+                try:
+                    if self.local:
+                        # Object stores have no directories; local paths do
+                        for remote in files:
+                            self.fs.makedirs(self.fs._parent(remote), exist_ok=True)
+                    self.fs.pipe(files)
+                except Exception as e:
+                    print(f"[uploader] Upload of {len(files)} document(s) failed: {e}")
+                    self._record_failures(len(files))
+
+            # Plan stats parts advance with the uploads, not only per pass
+            self._flush_plan_stats(due_only=True)
+
+            # Batch items, plus the sentinel if one was taken
+            for _ in range(len(batch) + int(done)):
+                self.pending.task_done()
+
+        session.close()
+
+    def _flush_plan_stats(self, due_only=False):
+        if self.plan_stats is None:
+            return
+        try:
+            if due_only:
+                self.plan_stats.maybe_flush()
+            else:
+                self.plan_stats.flush()
+        except Exception as e:
+            print(f"[uploader] Writing plan stats failed: {e}")
+
+    def _record_failures(self, n):
+        with self._lock:
+            self.failed += n
+
+def utc_timestamp() -> str:
+    # ISO-8601 UTC with microseconds, so overlapping queries can be ordered.
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
 def load_queries_from_directory(directory_path):
     queries = []
     for file_path in sorted(Path(directory_path).glob("q*.sql")):
         queries.append((file_path.stem, file_path.read_text().strip()))
     return queries
 
-def execute_query(query, query_id, trino_conn, trino_host, run_name, attempt, results_prefix, info_headers):
-    cursor = trino_conn.cursor()
+class ResponseByteCounter:
+    """
+    requests response hook that counts the body bytes the Trino client
+    receives on one connection (result pages and spooled segments).
+    """
+
+    def __init__(self):
+        self.total = 0
+
+    def __call__(self, response, *args, **kwargs):
+        self.total += len(response.content)
+
+def drain_results(cursor, drain, fetch_size, start_perf):
+    """
+    Drain the result set of an executed cursor.
+    Returns (rows, time to first row in seconds, decoded bytes or None).
+
+      iterate  : row-by-row DBAPI iteration (original behaviour)
+      fetchmany: batches of `fetch_size` rows
+      segments : spooled-protocol segments are downloaded but not decoded
+                 into rows (needs a "segment" cursor and a spooling-enabled
+                 coordinator)
+    """
+    rows = 0
+    ttfr = None
+
+    if drain == "segments":
+        segment_bytes = 0
+        for segment in cursor:
+            data = segment.data
+            if ttfr is None:
+                ttfr = time.perf_counter() - start_perf
+            segment_bytes += len(data)
+            rows += int(segment.metadata.get("rowsCount", 0))
+            if hasattr(segment, "acknowledge"):
+                segment.acknowledge()
+        return rows, ttfr, segment_bytes
+
+    if drain == "fetchmany":
+        # First row on its own, so a full batch is not waited for
+        if cursor.fetchone() is None:
+            return rows, ttfr, None
+        ttfr = time.perf_counter() - start_perf
+        rows = 1
+        while True:
+            batch = cursor.fetchmany(fetch_size)
+            if not batch:
+                break
+            rows += len(batch)
+        return rows, ttfr, None
+
+    for _ in cursor:
+        if ttfr is None:
+            ttfr = time.perf_counter() - start_perf
+        rows += 1
+    return rows, ttfr, None
+
+def execute_query(query, query_id, trino_conn, uploader, run_name, attempt, drain="iterate", fetch_size=10000):
+    cursor = trino_conn.cursor("segment" if drain == "segments" else "row")
+    counter = getattr(trino_conn, "response_bytes", None)
+    bytes_before = counter.total if counter is not None else 0
     start_perf = time.perf_counter()
-    start_time = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    start_time = utc_timestamp()
 
     try:
         cursor.execute(query)
-        for _ in cursor:
-            pass
+        rows, ttfr, segment_bytes = drain_results(cursor, drain, fetch_size, start_perf)
         end_perf = time.perf_counter()
-        end_time = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        end_time = utc_timestamp()
         trino_query_id = cursor.stats["queryId"]
         duration = end_perf - start_perf
 
-        print(f"[{query_id}] Runtime: {duration:.4f}s | Query ID: {trino_query_id}")
+        if segment_bytes is not None:
+            result_bytes = segment_bytes
+        elif counter is not None:
+            result_bytes = counter.total - bytes_before
+        else:
+            result_bytes = -1
 
-        # Scrape query info JSON from Trino UI API
-        url = f"http://{trino_host}:{TRINO_PORT}/ui/api/query/{trino_query_id}"
-        r = requests.get(url, headers=info_headers, timeout=30)
-        if r.ok:
-            doc = r.json()
-            doc["metrics"] = {} 
-            local_file = f"/tmp/{query_id}.json"
-            with open(local_file, "w") as f:
-                json.dump(doc, f, indent=2)
+        print(f"[{query_id}] Runtime: {duration:.4f}s | Rows: {rows} | Query ID: {trino_query_id}")
 
-            remote = join_url(results_prefix, run_name, f"lakehouse_run_{attempt}", f"{query_id}.json")
-            upload_file(local_file, remote)
+        # Query info JSON is scraped and uploaded in the background
+        if uploader is not None:
+            uploader.submit(trino_query_id, query_id, run_name, attempt)
 
-        return start_time, end_time, duration
+        return {
+            "start_time": start_time,
+            "end_time": end_time,
+            "Runtime (s)": duration,
+            # Empty results: the first (empty) page arrives with completion
+            "first_row_s": ttfr if ttfr is not None else duration,
+            "rows": rows,
+            "bytes": result_bytes,
+        }
     except Exception as e:
         print(f"[{query_id}] Failed: {e}")
-        return -1, -1, -1
+        return {"start_time": -1, "end_time": -1, "Runtime (s)": -1, "first_row_s": -1, "rows": -1, "bytes": -1}
 
-def run_workload(queries, trino_conn, trino_host, run_name, attempts, results_prefix, info_headers):
+def run_workload(queries, trino_conn, uploader, run_name, attempts, drain="iterate", fetch_size=10000, log=None):
     results = []
     for name, query in queries:
-        s, e, d = execute_query(query, name, trino_conn, trino_host, run_name, attempts, results_prefix, info_headers)
-        results.append({"query_id": name, "start_time": s, "end_time": e, "Runtime (s)": d})
+        entry = {"query_id": name, **execute_query(query, name, trino_conn, uploader, run_name, attempts, drain, fetch_size)}
+        if log is not None:
+            log.append(entry)
+        results.append(entry)
     return results
 
+def thread_query_runner(connect, uploader, run_name, attempts, drain="iterate", fetch_size=10000, log=None):
+    """
+    (run_one, close) for a pool of worker threads. run_one(name, query)
+    executes on the calling thread's own Trino connection, opened lazily;
+    close() closes every connection opened so far.
+    """
+    local = threading.local()
+    lock = threading.Lock()
+    opened = []
+
+    def run_one(name, query):
+        if not hasattr(local, "conn"):
+            local.conn = connect()
+            with lock:
+                opened.append(local.conn)
+        entry = {"query_id": name, **execute_query(query, name, local.conn, uploader, run_name, attempts, drain, fetch_size)}
+        if log is not None:
+            log.append(entry)
+        return entry
+
+    def close():
+        with lock:
+            for conn in opened:
+                conn.close()
+            opened.clear()
+
+    return run_one, close
+
+def run_workload_concurrent(queries, connect, uploader, run_name, attempts,
+                            concurrency, arrival="closed", arrival_rate=None, seed=0,
+                            drain="iterate", fetch_size=10000, log=None):
+    run_one, close = thread_query_runner(connect, uploader, run_name, attempts, drain, fetch_size, log)
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            if arrival == "closed":
+                # Closed loop: `concurrency` queries in flight, next one starts when one finishes.
+                futures = [pool.submit(run_one, name, query) for name, query in queries]
+            else:
+                # Open loop: Poisson arrivals at `arrival_rate` queries/s; arrivals
+                # beyond `concurrency` running queries wait for a free worker.
+                rng = random.Random(seed)
+                futures = []
+                t0 = time.perf_counter()
+                next_arrival = 0.0
+                for name, query in queries:
+                    delay = t0 + next_arrival - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    futures.append(pool.submit(run_one, name, query))
+                    next_arrival += rng.expovariate(arrival_rate)
+
+            # Same row order as the sequential log
+            return [f.result() for f in futures]
+    finally:
+        close()
+
+def load_replay_schedule(log_url: str):
+    """
+    Schedule of a recorded Workload_log_*.ndjson (local path or fsspec URL):
+    ({query_id: start offset in seconds}, peak number of overlapping queries).
+    Failed entries (no timestamps) are skipped.
+    """
+    intervals = {}
+    for line in read_remote_lines(log_url):
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(entry.get("start_time"), str) and isinstance(entry.get("end_time"), str):
+            intervals[entry["query_id"]] = (parse_log_time(entry["start_time"]), parse_log_time(entry["end_time"]))
+
+    if not intervals:
+        return {}, 1
+
+    t0 = min(start for start, _ in intervals.values())
+    offsets = {qid: (start - t0).total_seconds() for qid, (start, _) in intervals.items()}
+
+    # Sweep over start (+1) / end (-1) events; ends sort first on ties
+    events = sorted([(s, 1) for s, _ in intervals.values()] + [(e, -1) for _, e in intervals.values()])
+    running = peak = 0
+    for _, delta in events:
+        running += delta
+        peak = max(peak, running)
+
+    return dict(sorted(offsets.items(), key=lambda kv: kv[1])), max(1, peak)
+
+def run_workload_replay(queries, offsets, connect, uploader, run_name, attempts, concurrency,
+                        time_scale=1.0, drain="iterate", fetch_size=10000, log=None):
+    """
+    Start each query at its recorded offset divided by `time_scale`, on an
+    asyncio timer per query; execution runs on `concurrency` worker threads,
+    each with its own Trino connection (closed when the replay ends).
+    Offsets count from the earliest of `queries`, so a resumed pass starts
+    with its first pending query.
+    """
+    run_one, close = thread_query_runner(connect, uploader, run_name, attempts, drain, fetch_size, log)
+    base = min((offsets[name] for name, _ in queries), default=0.0)
+
+    async def replay(pool):
+        loop = asyncio.get_running_loop()
+        t0 = loop.time()
+
+        async def fire(name, query):
+            delay = t0 + (offsets[name] - base) / time_scale - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            return await loop.run_in_executor(pool, run_one, name, query)
+
+        return await asyncio.gather(*(fire(name, query) for name, query in queries))
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            return asyncio.run(replay(pool))
+    finally:
+        close()
+
 def write_results(results_list, run_name, attempt, results_prefix):
     # Required temp store to keep json before uploading to object storage.
     local_log = f"/tmp/Workload_log_run_{attempt}.ndjson"
@@ -79,6 +405,129 @@ def write_results(results_list, run_name, attempt, results_prefix):
     remote = join_url(results_prefix, run_name, f"Workload_log_run_{attempt}.ndjson")
     upload_file(local_log, remote)
 
+# Local ResultLog checkpoints, one directory per run name
+LOCAL_LOG_DIR = "/tmp/workload_logs"
+
+def local_log_path(run_name, attempt):
+    return os.path.join(LOCAL_LOG_DIR, run_name, f"Workload_log_run_{attempt}.ndjson")
+
+class ResultLog:
+    """
+    Append-as-you-go workload log, the checkpoint for --resume.
+
+    Every entry is appended to the local ndjson (see local_log_path) and
+    fsynced as soon as its query finishes. A snapshot of the file is uploaded
+    to the run's remote Workload_log_run_<attempt>.ndjson in the background;
+    while an upload is in flight, further entries are picked up by the next
+    one. load_completed() reads both, so entries that finished after the
+    last upload survive a restart on the same machine.
+    """
+
+    def __init__(self, run_name, attempt, results_prefix, completed=()):
+        self.local_path = local_log_path(run_name, attempt)
+        os.makedirs(os.path.dirname(self.local_path), exist_ok=True)
+        self.remote = join_url(results_prefix, run_name, f"Workload_log_run_{attempt}.ndjson")
+        self._lock = threading.Lock()
+        self._upload_pending = False
+        self._checkpoints = ThreadPoolExecutor(max_workers=1)
+
+        # Entries carried over from the interrupted run come first
+        self._file = open(self.local_path, "w")
+        for entry in completed:
+            self._file.write(json.dumps(entry) + "\n")
+        self._sync()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def append(self, entry):
+        with self._lock:
+            self._file.write(json.dumps(entry) + "\n")
+            self._sync()
+            if not self._upload_pending:
+                self._upload_pending = True
+                self._checkpoints.submit(self._checkpoint)
+
+    def _checkpoint(self):
+        # Snapshot under the lock so the upload never sees a partial line
+        with self._lock:
+            self._upload_pending = False
+            snapshot = self.local_path + ".ckpt"
+            shutil.copyfile(self.local_path, snapshot)
+        try:
+            upload_file(snapshot, self.remote)
+        except Exception as e:
+            print(f"[checkpoint] Upload of {self.remote} failed: {e}")
+
+    def close(self):
+        self._checkpoints.shutdown(wait=True)
+        self._file.close()
+        # Final, complete upload
+        upload_file(self.local_path, self.remote)
+
+def load_completed(run_name, attempt, results_prefix):
+    """
+    {query_id: log entry} of the queries that already succeeded in the
+    remote Workload_log_run_<attempt>.ndjson, merged with the local ResultLog
+    checkpoint if it is still on disk (it can be ahead of the last upload).
+    Torn lines are ignored.
+    """
+    completed = {}
+    remote = join_url(results_prefix, run_name, f"Workload_log_run_{attempt}.ndjson")
+    lines = read_remote_lines(remote)
+    local = local_log_path(run_name, attempt)
+    if os.path.exists(local):
+        with open(local) as f:
+            lines += f.read().splitlines()
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if entry.get("Runtime (s)", -1) != -1:
+            completed[entry["query_id"]] = entry
+    return completed
+
+def write_metrics(sampler, results_list, run_name, attempt, results_prefix):
+    local_file = f"/tmp/Metrics_run_{attempt}.parquet"
+    sampler.write(local_file, results_list)
+    remote = join_url(results_prefix, run_name, f"Metrics_run_{attempt}.parquet")
+    upload_file(local_file, remote)
+
+def run_attempt(order, completed, run_pass, uploader, run_name, attempt, results_prefix, sampler=None):
+    """
+    One measured pass: run_pass() the queries of `order` missing from
+    `completed`, then write the workload log of the whole pass in `order`.
+    If every query completed before an interruption, only the final log is
+    written; metrics are written only for queries that ran.
+    """
+    pending = [(name, query) for name, query in order if name not in completed]
+    if completed:
+        print(f"[resume] Attempt {attempt}: {len(completed)} completed, {len(pending)} to run")
+
+    results = []
+    if pending:
+        log = ResultLog(run_name, attempt, results_prefix, completed.values())
+        if sampler is not None:
+            sampler.start()
+        try:
+            results = run_pass(pending, attempt, uploader, log)
+        finally:
+            if sampler is not None:
+                sampler.stop()
+            log.close()
+
+    # Final log in pass order, including queries from the interrupted run
+    by_id = {**completed, **{r["query_id"]: r for r in results}}
+    results = [by_id[name] for name, _ in order]
+
+    # Flush query info uploads before the workload log is written
+    uploader.flush()
+    write_results(results, run_name, attempt, results_prefix)
+    if sampler is not None and pending:
+        write_metrics(sampler, results, run_name, attempt, results_prefix)
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run workload and upload results to cloud storage via fsspec.")
     parser.add_argument("--host", required=True)
@@ -91,17 +540,124 @@ if __name__ == "__main__":
     parser.add_argument("--trino_user", default=TRINO_USER)
     parser.add_argument("--trino_catalog", default=TRINO_CATALOG)
     parser.add_argument("--trino_schema", default=TRINO_SCHEMA)
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="Number of worker threads, each with its own Trino connection (1 = sequential; "
+                             "default 1, or the recorded peak overlap with --replay)")
+    parser.add_argument("--arrival", choices=["closed", "open"], default="closed",
+                        help="closed: next query starts when a worker frees up | open: Poisson arrivals at --arrival_rate")
+    parser.add_argument("--arrival_rate", type=float, default=None,
+                        help="Open-loop arrival rate in queries per second")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--drain", choices=["iterate", "fetchmany", "segments"], default="iterate",
+                        help="How results are drained: row iteration | fetchmany batches | spooled segments (not decoded)")
+    parser.add_argument("--fetch_size", type=int, default=10000,
+                        help="Rows per fetchmany() call with --drain fetchmany")
+    parser.add_argument("--warmup", type=int, default=0,
+                        help="Passes over the workload run first and discarded")
+    parser.add_argument("--repetitions", type=int, default=1,
+                        help="Measured passes; pass k is logged as attempt --attempt + k")
+    parser.add_argument("--shuffle", action="store_true",
+                        help="Shuffle the query order of every measured pass (seeded by --seed)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip queries already completed in Workload_log_run_<attempt>.ndjson "
+                             "(remote log and local checkpoint)")
+    parser.add_argument("--no_plan_stats", action="store_true",
+                        help="Do not extract query/operator stats into the plan_stats/ Parquet datasets")
+    parser.add_argument("--no_raw_json", action="store_true",
+                        help="Do not upload the raw query info JSON (lakehouse_run_<attempt>/q*.json)")
+    parser.add_argument("--replay", default=None,
+                        help="Workload_log_*.ndjson (path or fsspec URL) to replay at its recorded start offsets")
+    parser.add_argument("--time_scale", type=float, default=1.0,
+                        help="Replay time compression; 2.0 starts queries twice as fast as recorded")
+    parser.add_argument("--metrics_url", action="append", default=[],
+                        help="Prometheus endpoint sampled during measured passes, e.g. http://<host>:9090/metrics "
+                             "(JMX exporter) or :9100/metrics (node_exporter); repeatable")
+    parser.add_argument("--metrics_interval", type=float, default=1.0,
+                        help="Seconds between metric scrapes")
+    parser.add_argument("--metrics_filter", default=None,
+                        help="Regex; only metric names matching it are kept")
     args = parser.parse_args()
 
+    if args.concurrency is not None and args.concurrency < 1:
+        parser.error("--concurrency must be >= 1")
+    if args.arrival == "open" and not args.arrival_rate:
+        parser.error("--arrival open requires a positive --arrival_rate")
+    if args.replay and (args.shuffle or args.arrival == "open"):
+        parser.error("--replay takes its order and timing from the log; drop --shuffle / --arrival open")
+    if args.time_scale <= 0:
+        parser.error("--time_scale must be > 0")
+    if args.warmup < 0 or args.repetitions < 1:
+        parser.error("--warmup must be >= 0 and --repetitions >= 1")
+
     TRINO_PORT = args.trino_port
     INFO_HEADERS = {"X-Trino-User": args.trino_user}
 
-    # Establish a Trino connection
-    trino_conn = trino.dbapi.connect(
-        host=args.host, port=TRINO_PORT, user=args.trino_user,
-        catalog=args.trino_catalog, schema=args.trino_schema
-    )
+    def connect():
+        # Count the response bytes of each connection's own HTTP session
+        http_session = requests.Session()
+        counter = ResponseByteCounter()
+        http_session.hooks["response"].append(counter)
+
+        conn = trino.dbapi.connect(
+            host=args.host, port=TRINO_PORT, user=args.trino_user,
+            catalog=args.trino_catalog, schema=args.trino_schema,
+            http_session=http_session,
+        )
+        conn.response_bytes = counter
+        return conn
 
     queries = load_queries_from_directory(args.query_dir)
-    results = run_workload(queries, trino_conn, args.host, args.run_name, args.attempt, args.results_path, INFO_HEADERS)
-    write_results(results, args.run_name, args.attempt, args.results_path)
+
+    if args.replay:
+        offsets, recorded_concurrency = load_replay_schedule(args.replay)
+        by_name = dict(queries)
+        missing = [qid for qid in offsets if qid not in by_name]
+        if missing:
+            print(f"[replay] No query file for {', '.join(missing)}; skipped")
+        # Recorded order; peak recorded overlap unless --concurrency is given
+        queries = [(qid, by_name[qid]) for qid in offsets if qid in by_name]
+        replay_concurrency = recorded_concurrency if args.concurrency is None else args.concurrency
+        print(f"[replay] {len(queries)} queries over {max(offsets.values(), default=0):.1f}s recorded, "
+              f"time_scale={args.time_scale}, concurrency={replay_concurrency}")
+
+    concurrency = 1 if args.concurrency is None else args.concurrency
+    sequential = concurrency == 1 and args.arrival == "closed" and not args.replay
+    # Establish a Trino connection, kept across all passes
+    trino_conn = connect() if sequential else None
+
+    def run_pass(order, attempt, uploader, log=None):
+        if args.replay:
+            return run_workload_replay(
+                order, offsets, connect, uploader, args.run_name, attempt, replay_concurrency,
+                time_scale=args.time_scale, drain=args.drain, fetch_size=args.fetch_size, log=log,
+            )
+        if sequential:
+            return run_workload(order, trino_conn, uploader, args.run_name, attempt,
+                                drain=args.drain, fetch_size=args.fetch_size, log=log)
+        return run_workload_concurrent(
+            order, connect, uploader, args.run_name, attempt,
+            concurrency=concurrency, arrival=args.arrival, arrival_rate=args.arrival_rate, seed=args.seed,
+            drain=args.drain, fetch_size=args.fetch_size, log=log,
+        )
+
+    # Warm-up passes: caches, JIT and metadata; nothing is logged or uploaded
+    for i in range(args.warmup):
+        print(f"[warmup] Pass {i + 1}/{args.warmup}")
+        run_pass(queries, args.attempt, None)
+
+    rng = random.Random(args.seed)
+    plan_stats = None if args.no_plan_stats else PlanStatsWriter(args.results_path)
+    uploader = TraceUploader(args.host, TRINO_PORT, INFO_HEADERS, args.results_path,
+                             plan_stats=plan_stats, raw_json=not args.no_raw_json)
+    sampler = MetricsSampler(args.metrics_url, args.metrics_interval, args.metrics_filter) if args.metrics_url else None
+    try:
+        for rep in range(args.repetitions):
+            attempt = args.attempt + rep
+            order = rng.sample(queries, len(queries)) if args.shuffle else queries
+            if args.repetitions > 1:
+                print(f"[repetition] {rep + 1}/{args.repetitions} (attempt {attempt})")
+
+            completed = load_completed(args.run_name, attempt, args.results_path) if args.resume else {}
+            run_attempt(order, completed, run_pass, uploader, args.run_name, attempt, args.results_path, sampler)
+    finally:
+        uploader.close()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The client's modules import each other as top-level modules, as in the image
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
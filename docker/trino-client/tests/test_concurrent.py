@@ -0,0 +1,39 @@
+import threading
+
+import pytest
+
+import run_workload
+
+
+class _Conn:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.parametrize("arrival", ["closed", "poisson"])
+def test_concurrent_run_closes_thread_connections(monkeypatch, arrival):
+    conns = []
+    threads = set()
+
+    def execute_query(query, query_id, conn, *args):
+        threads.add(threading.get_ident())
+        assert not conn.closed
+        return {"Runtime (s)": 0.0}
+
+    def connect():
+        conns.append(_Conn())
+        return conns[-1]
+
+    monkeypatch.setattr(run_workload, "execute_query", execute_query)
+    queries = [(f"q{i}", f"SELECT {i}") for i in range(8)]
+
+    results = run_workload.run_workload_concurrent(
+        queries, connect, uploader=None, run_name="run1", attempts=1,
+        concurrency=3, arrival=arrival, arrival_rate=1000.0,
+    )
+
+    assert [r["query_id"] for r in results] == [name for name, _ in queries]
+    assert 1 <= len(conns) == len(threads) <= 3
+    assert all(c.closed for c in conns)
@@ -0,0 +1,57 @@
+import threading
+
+import pytest
+
+import import_tables
+
+
+class _Conn:
+    def __init__(self):
+        self.closed = False
+        self.cursors = []
+
+    def cursor(self):
+        cursor = _Cursor()
+        self.cursors.append(cursor)
+        return cursor
+
+    def close(self):
+        self.closed = True
+
+
+class _Cursor:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.parametrize("fail", [False, True])
+def test_parallel_registration_closes_thread_connections(monkeypatch, fail):
+    conns = []
+    threads = set()
+
+    def connect(host, schema):
+        conns.append(_Conn())
+        return conns[-1]
+
+    def register(cursor, schema, table, table_path, metadata_file):
+        threads.add(threading.get_ident())
+        if fail and table == "t3":
+            raise RuntimeError("boom")
+        return True
+
+    monkeypatch.setattr(import_tables, "connect_trino", connect)
+    monkeypatch.setattr(import_tables, "register_table", register)
+    jobs = [(f"t{i}", f"s3://wh/t{i}", "v1.metadata.json") for i in range(8)]
+
+    if fail:
+        with pytest.raises(RuntimeError):
+            import_tables.register_tables_parallel("trino", "tpcds", jobs, parallel=3)
+    else:
+        results = import_tables.register_tables_parallel("trino", "tpcds", jobs, parallel=3)
+        assert [(table, ok) for table, ok, _ in results] == [(f"t{i}", True) for i in range(8)]
+
+    assert 1 <= len(conns) <= 3
+    assert len(conns) == len(threads)
+    assert all(c.closed and len(c.cursors) == 1 and c.cursors[0].closed for c in conns)
@@ -0,0 +1,100 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pyarrow.parquet as pq
+import pytest
+import requests
+
+from metrics_sampler import MetricsSampler, parse_log_time
+
+EXPOSITION = b"""\
+# HELP jvm_memory_bytes_used Used bytes of a given JVM memory area.
+# TYPE jvm_memory_bytes_used gauge
+jvm_memory_bytes_used{area="heap",} 1.5E9
+jvm_memory_bytes_used{area="nonheap",} 2.5E8
+# TYPE trino_running_queries gauge
+trino_running_queries 3.0
+process_cpu_seconds_total 12.5 1700000000000
+"""
+
+
+class _Exposition(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(EXPOSITION)))
+        self.end_headers()
+        self.wfile.write(EXPOSITION)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def metrics_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Exposition)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _log_time(dt, fractional=True):
+    return dt.strftime("%Y-%m-%dT%H:%M:%S.%fZ" if fractional else "%Y-%m-%dT%H:%M:%SZ")
+
+
+def test_parse_log_time_with_and_without_fraction():
+    assert parse_log_time("2024-11-09T19:00:00Z") == datetime(2024, 11, 9, 19, tzinfo=timezone.utc)
+    assert parse_log_time("2024-11-09T19:00:00.250000Z") == datetime(2024, 11, 9, 19, 0, 0, 250000, tzinfo=timezone.utc)
+
+
+def test_scrapes_are_written_to_parquet(metrics_url, tmp_path):
+    sampler = MetricsSampler(
+        [f"{metrics_url}/metrics", f"{metrics_url}/missing"],
+        name_filter=r"jvm_.*|trino_.*",
+    )
+    with requests.Session() as session:
+        sampler.scrape(session)
+        sampler.scrape(session)
+
+    now = datetime.now(timezone.utc)
+    results = [
+        # Second-resolution timestamps must parse as well as microsecond ones
+        {"query_id": "q1", "start_time": _log_time(now - timedelta(minutes=1), fractional=False),
+         "end_time": _log_time(now + timedelta(minutes=1))},
+        {"query_id": "q2", "start_time": _log_time(now - timedelta(hours=2)),
+         "end_time": _log_time(now - timedelta(hours=1), fractional=False)},
+        {"query_id": "q3", "start_time": -1, "end_time": -1, "Runtime (s)": -1},
+    ]
+    path = tmp_path / "Metrics_run_0.parquet"
+    sampler.write(str(path), results)
+
+    table = pq.read_table(path)
+    assert table.column_names == ["ts", "endpoint", "metric", "labels", "value", "queries"]
+    rows = table.to_pylist()
+    assert [(r["metric"], r["labels"], r["value"]) for r in rows] == 2 * [
+        ("jvm_memory_bytes_used", '{area="heap",}', 1.5e9),
+        ("jvm_memory_bytes_used", '{area="nonheap",}', 2.5e8),
+        ("trino_running_queries", "", 3.0),
+    ]
+    assert {r["endpoint"] for r in rows} == {f"{metrics_url}/metrics"}
+    assert {r["queries"] for r in rows} == {"q1"}
+    assert sampler.errors == 2
+
+
+def test_background_thread_samples_until_stopped(metrics_url):
+    sampler = MetricsSampler([f"{metrics_url}/metrics"], interval=0.05)
+    sampler.start()
+    time.sleep(0.3)
+    sampler.stop()
+
+    scrapes = len(sampler.scrape_ts)
+    assert scrapes >= 2
+    assert len(sampler.row_value) == 4 * scrapes
+    assert sampler.errors == 0
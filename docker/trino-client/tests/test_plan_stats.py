@@ -0,0 +1,92 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pyarrow.dataset as ds
+import pytest
+
+from plan_stats import PlanStatsWriter
+from run_workload import TraceUploader
+
+
+def _doc(trino_query_id):
+    return {
+        "queryId": trino_query_id,
+        "state": "FINISHED",
+        "queryStats": {
+            "elapsedTime": "1.50s",
+            "outputPositions": 10,
+            "operatorSummaries": [
+                {"stageId": 0, "pipelineId": 0, "operatorId": 0, "operatorType": "TableScanOperator"},
+            ],
+        },
+    }
+
+
+class _QueryInfo(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps(_doc(self.path.rsplit("/", 1)[-1])).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def coordinator():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _QueryInfo)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address
+    server.shutdown()
+    server.server_close()
+
+
+def _query_ids(prefix):
+    path = f"{prefix}/plan_stats/queries"
+    try:
+        dataset = ds.dataset(path, format="parquet", partitioning="hive")
+    except FileNotFoundError:
+        return []
+    return sorted(dataset.to_table(columns=["query_id"]).column("query_id").to_pylist())
+
+
+def test_maybe_flush_after_rows_or_interval(tmp_path):
+    writer = PlanStatsWriter(str(tmp_path), flush_rows=2, flush_interval=3600)
+    assert not writer.maybe_flush()
+    writer.add("run1", 1, "q1", _doc("t1"))
+    assert not writer.maybe_flush()
+    writer.add("run1", 1, "q2", _doc("t2"))
+    assert writer.maybe_flush()
+    assert _query_ids(tmp_path) == ["q1", "q2"]
+
+    writer.flush_interval = 0
+    writer.add("run1", 1, "q3", _doc("t3"))
+    assert writer.maybe_flush()
+    assert _query_ids(tmp_path) == ["q1", "q2", "q3"]
+    operators = ds.dataset(f"{tmp_path}/plan_stats/operators", format="parquet", partitioning="hive")
+    assert operators.count_rows() == 3
+
+
+def test_uploader_writes_plan_stats_before_close(tmp_path, coordinator):
+    host, port = coordinator
+    writer = PlanStatsWriter(str(tmp_path), flush_rows=3, flush_interval=3600)
+    uploader = TraceUploader(host, port, {}, str(tmp_path), workers=1, batch_size=1,
+                             plan_stats=writer, raw_json=False)
+    try:
+        for i in range(7):
+            uploader.submit(f"t{i}", f"q{i}", "run1", 1)
+        deadline = time.monotonic() + 10
+        while len(_query_ids(tmp_path)) < 6 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        # Parts for two full groups are on storage while the pass still runs
+        assert _query_ids(tmp_path) == [f"q{i}" for i in range(6)]
+    finally:
+        uploader.close()
+    assert _query_ids(tmp_path) == [f"q{i}" for i in range(7)]
+    assert uploader.failed == 0
@@ -0,0 +1,40 @@
+import time
+
+import run_workload
+
+
+class _Conn:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_resumed_replay_starts_at_first_pending_query(monkeypatch):
+    started = {}
+    conns = []
+    t0 = time.perf_counter()
+
+    def execute_query(query, query_id, conn, *args):
+        started[query_id] = time.perf_counter() - t0
+        return {"Runtime (s)": 0.0}
+
+    def connect():
+        conns.append(_Conn())
+        return conns[-1]
+
+    monkeypatch.setattr(run_workload, "execute_query", execute_query)
+    offsets = {"q1": 0.0, "q2": 40.0, "q3": 42.0}
+    # q1 completed before the interruption
+    pending = [("q2", "SELECT 2"), ("q3", "SELECT 3")]
+
+    results = run_workload.run_workload_replay(
+        pending, offsets, connect=connect, uploader=None, run_name="run1", attempts=1,
+        concurrency=2, time_scale=10.0,
+    )
+
+    assert [r["query_id"] for r in results] == ["q2", "q3"]
+    assert started["q2"] < 0.1
+    assert 0.15 < started["q3"] < 0.5
+    # Per-thread connections are closed once the replay is done
+    assert conns and all(c.closed for c in conns)
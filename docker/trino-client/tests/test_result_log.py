@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+import run_workload
+from run_workload import ResultLog, load_completed, local_log_path
+
+
+@pytest.fixture
+def results_prefix(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_workload, "LOCAL_LOG_DIR", str(tmp_path / "local"))
+    (tmp_path / "remote" / "run1").mkdir(parents=True)
+    return str(tmp_path / "remote")
+
+
+def _entry(qid, runtime):
+    return {"query_id": qid, "Runtime (s)": runtime}
+
+
+def test_resume_merges_local_checkpoint_ahead_of_upload(results_prefix):
+    log = ResultLog("run1", 1, results_prefix)
+    log.append(_entry("q1", 1.5))
+    log.close()
+    # Killed after the q1 upload: q2 (failed) and q3 only reached the local
+    # checkpoint, and q4 was torn mid-write
+    with open(local_log_path("run1", 1), "a") as f:
+        f.write(json.dumps(_entry("q2", -1)) + "\n")
+        f.write(json.dumps(_entry("q3", 2.5)) + "\n")
+        f.write('{"query_id": "q4", "Runt')
+
+    completed = load_completed("run1", 1, results_prefix)
+    assert completed == {"q1": _entry("q1", 1.5), "q3": _entry("q3", 2.5)}
+
+    # Re-opening the log for the resumed pass keeps every completed entry
+    log = ResultLog("run1", 1, results_prefix, completed.values())
+    log.append(_entry("q2", 0.5))
+    log.close()
+    assert load_completed("run1", 1, results_prefix) == {
+        "q1": _entry("q1", 1.5), "q3": _entry("q3", 2.5), "q2": _entry("q2", 0.5),
+    }
+
+
+def test_resume_ignores_other_runs_checkpoints(results_prefix):
+    log = ResultLog("run2", 1, results_prefix)
+    log.append(_entry("q1", 1.0))
+    log.close()
+
+    assert load_completed("run1", 1, results_prefix) == {}
+    assert load_completed("run2", 1, results_prefix) == {"q1": _entry("q1", 1.0)}
+
+
+class _Uploader:
+    flushed = 0
+
+    def flush(self):
+        self.flushed += 1
+
+
+def _read_log(results_prefix, run_name, attempt):
+    with open(f"{results_prefix}/{run_name}/Workload_log_run_{attempt}.ndjson") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_resume_with_nothing_pending_still_writes_final_log(results_prefix):
+    # Killed after the last query reached the checkpoint, before the final log
+    log = ResultLog("run1", 1, results_prefix)
+    log.append(_entry("q2", 2.0))
+    log.append(_entry("q1", 1.0))
+    log.close()
+    completed = load_completed("run1", 1, results_prefix)
+
+    def run_pass(*args):
+        raise AssertionError("nothing to run")
+
+    uploader = _Uploader()
+    order = [("q1", "SELECT 1"), ("q2", "SELECT 2")]
+    run_workload.run_attempt(order, completed, run_pass, uploader, "run1", 1, results_prefix)
+
+    assert uploader.flushed == 1
+    assert _read_log(results_prefix, "run1", 1) == [_entry("q1", 1.0), _entry("q2", 2.0)]
+
+
+def test_resume_runs_only_pending_queries(results_prefix):
+    log = ResultLog("run1", 1, results_prefix)
+    log.append(_entry("q2", 2.0))
+    log.close()
+    completed = load_completed("run1", 1, results_prefix)
+    ran = []
+
+    def run_pass(pending, attempt, uploader, log):
+        ran.extend(name for name, _ in pending)
+        return [_entry(name, 0.5) for name, _ in pending]
+
+    order = [("q1", "SELECT 1"), ("q2", "SELECT 2"), ("q3", "SELECT 3")]
+    run_workload.run_attempt(order, completed, run_pass, _Uploader(), "run1", 1, results_prefix)
+
+    assert ran == ["q1", "q3"]
+    assert _read_log(results_prefix, "run1", 1) == [_entry("q1", 0.5), _entry("q2", 2.0), _entry("q3", 0.5)]
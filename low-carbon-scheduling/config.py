@@ -1,4 +1,4 @@
-from src.scheduler import FIFOScheduler, GreedyLowCarbonDeferScheduler
+from src.scheduler import FIFOScheduler, GreedyLowCarbonDeferScheduler, LocalSearchScheduler
 
 # =====================  FILEPATHS  =====================
 
@@ -55,4 +55,13 @@ SWAP_PROB                        = 0.5
 MAX_ITERS                        = 5000
 MAX_SHIFT_SLOTS                  = 86400
 
+local_search_scheduler           = LocalSearchScheduler(
+                                     name="Local Search",
+                                     seed_scheduler=greedy_defer_order_scheduler,
+                                     swap_prob=SWAP_PROB,
+                                     max_iters=MAX_ITERS,
+                                     max_shift_slots=MAX_SHIFT_SLOTS,
+                                     random_seed=SEED,
+                                 )
+
 schedulers                       = [fifo_scheduler, greedy_defer_order_scheduler]
\ No newline at end of file
@@ -1,3 +1,9 @@
+import os
+import json
+import hashlib
+import tempfile
+from collections import OrderedDict
+
 import pandas as pd
 import numpy as np
 
@@ -46,10 +52,9 @@ def load_carbon_timeseries(
     return df, ci, slot_sec, dt_hours
 
 
-def upsample_ci(ci, old_slot_sec, new_slot_sec):
+def upsample_factor(old_slot_sec, new_slot_sec):
     """
-    Upsample carbon intensity array from old_slot_sec to new_slot_sec
-    by repeating each value.
+    Number of new_slot_sec slots per old_slot_sec slot.
     """
     if new_slot_sec > old_slot_sec:
         raise ValueError("new_slot_sec must be <= old_slot_sec")
@@ -62,7 +67,15 @@ def upsample_ci(ci, old_slot_sec, new_slot_sec):
             f"old_slot_sec ({old_slot_sec}) must be an integer multiple of "
             f"new_slot_sec ({new_slot_sec}); got ratio={ratio}"
         )
+    return factor
 
+
+def upsample_ci(ci, old_slot_sec, new_slot_sec):
+    """
+    Upsample carbon intensity array from old_slot_sec to new_slot_sec
+    by repeating each value.
+    """
+    factor = upsample_factor(old_slot_sec, new_slot_sec)
     ci_new = np.repeat(ci, factor)
     dt_hours_new = float(new_slot_sec) / 3600.0
     return ci_new, float(new_slot_sec), dt_hours_new
@@ -99,17 +112,96 @@ def carbon_emissions(
     return float(window_sum * power_kw * dt_hours)
 
 
+def build_best_start_index(costs, num_candidates, step=1):
+    """
+    Sliding-window argmin over strided candidates.
+
+    For every start e, returns the index of the lowest entry among
+    costs[e], costs[e + step], ..., costs[e + (num_candidates - 1) * step]
+    (clipped to the array). Ties go to the earliest index; NaN is never
+    preferred over a number. Built by doubling, so it needs O(n log k) time
+    and O(n) memory.
+    """
+    val = np.where(np.isnan(costs), np.inf, costs)
+    n = len(val)
+    idx = np.arange(n, dtype=np.int32 if n < 2**31 else np.int64)
+
+    span = 1
+    while span * 2 <= num_candidates:
+        shift = span * step
+        if shift < n:
+            take_right = val[shift:] < val[:n - shift]
+            np.copyto(idx[:n - shift], idx[shift:], where=take_right)
+            np.minimum(val[:n - shift], val[shift:], out=val[:n - shift])
+        span *= 2
+
+    # Cover the remaining candidates with a second, overlapping window
+    shift = (num_candidates - span) * step
+    if 0 < shift < n:
+        take_right = val[shift:] < val[:n - shift]
+        np.copyto(idx[:n - shift], idx[shift:], where=take_right)
+
+    return idx
+
+
+def _ci_cache_entry_dir(cache_dir, csv_path, use_lifecycle, start, end, upsample_to_sec, lazy):
+    """
+    Cache entry directory for one (csv, mtime, lifecycle, start, end, upsample, lazy) key.
+    """
+    csv_path = os.path.abspath(csv_path)
+    key = (
+        csv_path,
+        os.stat(csv_path).st_mtime_ns,
+        bool(use_lifecycle),
+        None if start is None else str(pd.to_datetime(start)),
+        None if end is None else str(pd.to_datetime(end)),
+        float(upsample_to_sec),
+        bool(lazy),
+    )
+    digest = hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(cache_dir, f"{stem}-{digest}")
+
+
 class CarbonProfile:
     """
     Wraps CI time series + dt_hours + prefix sums, and exposes window_carbon().
+
+    With upsample_factor > 1 the profile is lazily upsampled: `ci` and
+    `ci_prefix` stay at native resolution and each native value covers
+    `upsample_factor` slots of `slot_sec`. Window sums use whole native slots
+    plus partial head/tail, and match the materialised array's up to the
+    rounding error of the prefix sums, so the same schedule costs the same
+    carbon in both modes.
+
+    Schedules themselves can differ: windows inside one native slot have
+    the same true sum, and the two modes' rounding errors break such ties
+    differently, so a scheduler can pick other starts and the totals drift
+    by a few percent. Use the materialised profile where results must
+    match published numbers.
     """
 
-    def __init__(self, ci, slot_sec, df=None):
+    def __init__(self, ci, slot_sec, df=None, index_cache_bytes=128 * 2**20, ci_prefix=None, upsample_factor=1):
         self.ci = np.asarray(ci, dtype=float)
         self.slot_sec = float(slot_sec)
         self.dt_hours = self.slot_sec / 3600.0
         self.df = df
-        self.ci_prefix = make_ci_prefix(self.ci)
+        self.ci_prefix = make_ci_prefix(self.ci) if ci_prefix is None else ci_prefix
+        self.upsample_factor = int(upsample_factor)
+
+        # LRU of best-start indices keyed by (duration, horizon, step, power_kw).
+        # Each index holds one int32 per slot (4 * num_slots bytes, ~1.7 MB for
+        # 5 days of 1-second slots); the cache is capped at index_cache_bytes.
+        self.index_cache_bytes = int(index_cache_bytes)
+        self._best_start_indices = OrderedDict()
+        self._index_cache_nbytes = 0
+
+    def __getstate__(self):
+        # Best-start indices are rebuilt lazily; don't ship them between processes
+        state = self.__dict__.copy()
+        state["_best_start_indices"] = OrderedDict()
+        state["_index_cache_nbytes"] = 0
+        return state
 
     @classmethod
     def from_csv(
@@ -119,30 +211,190 @@ class CarbonProfile:
         start=None,
         end=None,
         upsample_to_sec=1,
+        cache_dir=None,
+        lazy=False,
     ):
+        """
+        Load, filter and upsample a CI csv.
+
+        With `cache_dir`, the upsampled `ci` and `ci_prefix` are stored there as
+        .npy files keyed by (csv path, mtime, lifecycle flag, start, end,
+        upsample_to_sec) and memory-mapped on later loads, so processes loading
+        the same profile share pages instead of rebuilding the arrays.
+
+        With `lazy`, the series is kept at native resolution instead of being
+        repeated up to `upsample_to_sec` slots (see CarbonProfile).
+        """
+        if cache_dir is not None:
+            entry_dir = _ci_cache_entry_dir(
+                cache_dir, csv_path, use_lifecycle, start, end, upsample_to_sec, lazy
+            )
+            if os.path.isdir(entry_dir):
+                return cls._from_cache(entry_dir)
+
         df_ci, ci_raw, slot_sec_raw, _ = load_carbon_timeseries(
             csv_path,
             use_lifecycle=use_lifecycle,
             start=start,
             end=end,
         )
-        ci, slot_sec, _ = upsample_ci(ci_raw, slot_sec_raw, upsample_to_sec)
-        return cls(ci=ci, slot_sec=slot_sec, df=df_ci)
+        if lazy:
+            factor = upsample_factor(slot_sec_raw, upsample_to_sec)
+            profile = cls(ci=ci_raw, slot_sec=upsample_to_sec, df=df_ci, upsample_factor=factor)
+        else:
+            ci, slot_sec, _ = upsample_ci(ci_raw, slot_sec_raw, upsample_to_sec)
+            profile = cls(ci=ci, slot_sec=slot_sec, df=df_ci)
+
+        if cache_dir is not None:
+            profile._to_cache(entry_dir)
+        return profile
+
+    @classmethod
+    def _from_cache(cls, entry_dir):
+        with open(os.path.join(entry_dir, "meta.json")) as f:
+            meta = json.load(f)
+        return cls(
+            ci=np.load(os.path.join(entry_dir, "ci.npy"), mmap_mode="r"),
+            slot_sec=meta["slot_sec"],
+            df=pd.read_pickle(os.path.join(entry_dir, "df.pkl")),
+            ci_prefix=np.load(os.path.join(entry_dir, "ci_prefix.npy"), mmap_mode="r"),
+            upsample_factor=meta.get("upsample_factor", 1),
+        )
+
+    def _to_cache(self, entry_dir):
+        # Write to a temp dir and rename, so concurrent readers never see a partial entry
+        parent = os.path.dirname(entry_dir)
+        os.makedirs(parent, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=parent, prefix=".tmp-")
+        np.save(os.path.join(tmp_dir, "ci.npy"), self.ci)
+        np.save(os.path.join(tmp_dir, "ci_prefix.npy"), self.ci_prefix)
+        pd.to_pickle(self.df, os.path.join(tmp_dir, "df.pkl"))
+        with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+            json.dump({"slot_sec": self.slot_sec, "upsample_factor": self.upsample_factor}, f)
+        try:
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            # Another process cached the same profile first
+            for name in os.listdir(tmp_dir):
+                os.remove(os.path.join(tmp_dir, name))
+            os.rmdir(tmp_dir)
 
     @property
     def num_slots(self):
-        return len(self.ci)
+        return len(self.ci) * self.upsample_factor
+
+    @property
+    def index_cache_size(self):
+        """
+        Number of best-start indices that fit in index_cache_bytes.
+        """
+        itemsize = 4 if self.num_slots < 2**31 else 8
+        return self.index_cache_bytes // max(1, self.num_slots * itemsize)
+
+    def prefix_at(self, slots):
+        """
+        Sum of the per-slot CI over [0, slots), for a slot index or an array of them.
+        """
+        if self.upsample_factor == 1:
+            return self.ci_prefix[slots]
+        # Whole native slots plus the partial native slot at the end
+        native, partial = np.divmod(slots, self.upsample_factor)
+        head = np.minimum(native, len(self.ci) - 1)
+        return self.upsample_factor * self.ci_prefix[native] + partial * self.ci[head]
 
     def window_carbon(self, start_slot, duration_slots, power_kw=0.150):
         """
         Carbon emissions for a query occupying [start_slot, start_slot + duration_slots).
         """
-        return carbon_emissions(
-            self.ci,
-            start_slot,
-            duration_slots,
-            power_kw=power_kw,
-            dt_hours=self.dt_hours,
-            ci_prefix=self.ci_prefix,
+        if self.upsample_factor == 1:
+            return carbon_emissions(
+                self.ci,
+                start_slot,
+                duration_slots,
+                power_kw=power_kw,
+                dt_hours=self.dt_hours,
+                ci_prefix=self.ci_prefix,
+            )
+
+        end = min(start_slot + duration_slots, self.num_slots)
+        if end <= start_slot:
+            return 0.0
+        window_sum = self.prefix_at(end) - self.prefix_at(start_slot)
+        return float(window_sum * power_kw * self.dt_hours)
+
+    def window_carbon_range(self, start_slot, stop_slot, duration_slots, step=1, power_kw=0.150):
+        """
+        Vectorised window_carbon() for every start in range(start_slot, stop_slot, step).
+        Returns a float array with one entry per candidate start.
+        """
+        starts = np.arange(start_slot, stop_slot, step)
+        if len(starts) == 0:
+            return np.empty(0, dtype=float)
+
+        n = self.num_slots
+        last = int(starts[-1])
+        if self.upsample_factor == 1 and duration_slots > 0 and last + duration_slots <= n:
+            # Common case: every window fits, so both ends are strided slices
+            window_sum = (
+                self.ci_prefix[start_slot + duration_slots:last + duration_slots + 1:step]
+                - self.ci_prefix[start_slot:last + 1:step]
+            )
+        else:
+            return self.window_carbon_many(starts, duration_slots, power_kw=power_kw)
+
+        # gCO2 = (g/kWh) * (kWh)
+        return window_sum * power_kw * self.dt_hours
+
+    def window_carbon_many(self, start_slots, duration_slots, power_kw=0.150):
+        """
+        Element-wise window_carbon() over (broadcast) arrays of starts and durations.
+        """
+        starts = np.asarray(start_slots)
+        n = self.num_slots
+
+        # Windows running past the end of the CI are truncated, as in carbon_emissions()
+        ends = np.minimum(starts + duration_slots, n)
+        begins = np.minimum(starts, n)
+        window_sum = np.where(
+            ends > starts,
+            self.prefix_at(ends) - self.prefix_at(begins),
+            0.0,
         )
 
+        # gCO2 = (g/kWh) * (kWh)
+        return window_sum * power_kw * self.dt_hours
+
+    def _best_start_index(self, duration_slots, horizon_slots, step, power_kw):
+        key = (int(duration_slots), int(horizon_slots), int(step), float(power_kw))
+        index = self._best_start_indices.get(key)
+        if index is not None:
+            self._best_start_indices.move_to_end(key)
+            return index
+
+        # Only starts whose window fits inside the CI are indexed
+        costs = self.window_carbon_range(
+            0, self.num_slots - duration_slots + 1, duration_slots, power_kw=power_kw
+        )
+        index = build_best_start_index(costs, horizon_slots // step + 1, step=step)
+
+        self._best_start_indices[key] = index
+        self._index_cache_nbytes += index.nbytes
+        # Evict least recently used indices, but always keep the new one
+        while self._index_cache_nbytes > self.index_cache_bytes and len(self._best_start_indices) > 1:
+            _, evicted = self._best_start_indices.popitem(last=False)
+            self._index_cache_nbytes -= evicted.nbytes
+        return index
+
+    def best_start(self, duration_slots, earliest, horizon_slots, step=1, power_kw=0.150):
+        """
+        Lowest-carbon start in range(earliest, earliest + horizon_slots + 1, step),
+        clipped so the window fits inside the CI. Ties go to the earliest start.
+        If no window fits, returns `earliest`.
+
+        The first call for a (duration, horizon, step) builds an index over
+        every start; later calls are O(1).
+        """
+        if earliest > self.num_slots - duration_slots:
+            return earliest
+        index = self._best_start_index(duration_slots, horizon_slots, step, power_kw)
+        return int(index[earliest])
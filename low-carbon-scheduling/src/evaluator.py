@@ -0,0 +1,151 @@
+from typing import Dict, List, Sequence, Union
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.workload import Workload, ColumnarWorkload
+from src.carbon import CarbonProfile
+
+
+@dataclass
+class ScheduleEvaluation:
+    """
+    Metrics of one or more schedules (arrays have one entry per schedule).
+
+      carbon_total_gco2 : realised carbon, as realised_carbon_sequential()
+      makespan_slots    : end of the timeline when blocking for max(pred, actual),
+                          as SchedulerExperiment's makespan
+      fit_end_slot      : end of the timeline under the blocking semantics
+                          checked by assert_schedule_fits_sequential()
+    """
+    carbon_total_gco2: np.ndarray
+    makespan_slots: np.ndarray
+    fit_end_slot: np.ndarray
+
+
+def sequential_starts(planned, block_slots):
+    """
+    Realised start slots of queries run back-to-back on one machine in
+    planned order: start_i = max(planned_i, start_{i-1} + block_{i-1}).
+
+    This is a max-plus prefix scan: with B_i the blocked slots before i,
+    start_i = B_i + max(0, max_{j<=i}(planned_j - B_j)). Works along the last
+    axis, so a batch of sorted schedules is scanned at once.
+
+    Returns (starts, end_slot) where end_slot is where the timeline ends.
+    """
+    before = np.cumsum(block_slots, axis=-1) - block_slots
+    starts = before + np.maximum(np.maximum.accumulate(planned - before, axis=-1), 0)
+    if starts.shape[-1] == 0:
+        return starts, np.zeros(starts.shape[:-1], dtype=np.int64)
+    return starts, starts[..., -1] + block_slots[..., -1]
+
+
+class ScheduleEvaluator:
+    """
+    Scores schedules of a workload under the single-machine sequential
+    semantics used by realised_carbon_sequential(),
+    assert_schedule_fits_sequential() and the experiment makespan, in one
+    vectorised pass over (start, pred, actual) arrays.
+
+    Schedules are {query id: start slot} dicts, or an array of start slots
+    per query in workload order (shape (n,) or (batch, n)). Queries with equal
+    starts run in dict order, or workload order for arrays, as in the
+    stable sort of the scalar functions.
+    """
+
+    def __init__(
+        self,
+        workload: Workload,
+        carbon_profile: CarbonProfile,
+        power_kw: float = 0.150,
+        local_search: bool = False,
+    ):
+        self.carbon_profile = carbon_profile
+        self.power_kw = float(power_kw)
+        self.local_search = local_search
+        self.oracle = getattr(workload, "oracle", False)
+
+        if isinstance(workload, ColumnarWorkload):
+            self.ids = workload.ids.tolist()
+            self.pred_slots = workload.pred_slots
+            self.actual_slots = workload.actual_slots
+        else:
+            self.ids = [q.id for q in workload.queries]
+            self.pred_slots = np.array([q.pred_slots for q in workload.queries], dtype=np.int64)
+            self.actual_slots = np.array([q.actual_slots for q in workload.queries], dtype=np.int64)
+        self.position = {jid: i for i, jid in enumerate(self.ids)}
+
+    def to_arrays(self, schedule: Dict[str, int]):
+        """
+        (query positions, start slots) of a schedule dict, in dict order.
+        """
+        positions = np.fromiter((self.position[jid] for jid in schedule), dtype=np.int64, count=len(schedule))
+        starts = np.fromiter(schedule.values(), dtype=np.int64, count=len(schedule))
+        return positions, starts
+
+    def evaluate(self, schedule: Union[Dict[str, int], np.ndarray]) -> ScheduleEvaluation:
+        """
+        Evaluate a single schedule; the metrics are scalars.
+        """
+        if isinstance(schedule, dict):
+            positions, starts = self.to_arrays(schedule)
+        else:
+            starts = np.asarray(schedule, dtype=np.int64)
+            positions = np.arange(len(starts))
+
+        result = self._evaluate(starts[None, :], positions[None, :])
+        return ScheduleEvaluation(
+            carbon_total_gco2=float(result.carbon_total_gco2[0]),
+            makespan_slots=int(result.makespan_slots[0]),
+            fit_end_slot=int(result.fit_end_slot[0]),
+        )
+
+    def evaluate_batch(
+        self,
+        schedules: Union[Sequence[Dict[str, int]], np.ndarray],
+    ) -> ScheduleEvaluation:
+        """
+        Evaluate many schedules of the same queries at once.
+        `schedules` is a list of dicts or a (batch, n) array of start slots.
+        """
+        if isinstance(schedules, np.ndarray):
+            starts = np.atleast_2d(schedules).astype(np.int64, copy=False)
+            positions = np.broadcast_to(np.arange(starts.shape[1]), starts.shape)
+        else:
+            pairs: List = [self.to_arrays(s) for s in schedules]
+            positions = np.stack([p for p, _ in pairs])
+            starts = np.stack([s for _, s in pairs])
+
+        return self._evaluate(starts, positions)
+
+    def _evaluate(self, starts, positions) -> ScheduleEvaluation:
+        # Planned order; stable so ties keep dict / workload order
+        order = np.argsort(starts, axis=1, kind="stable")
+        planned = np.take_along_axis(starts, order, axis=1)
+        queries = np.take_along_axis(positions, order, axis=1)
+        pred = self.pred_slots[queries]
+        actual = self.actual_slots[queries]
+        longest = np.maximum(pred, actual)
+
+        # Carbon is charged over the actual runtime
+        carbon_block = pred if self.local_search else actual
+        run_starts, _ = sequential_starts(planned, carbon_block)
+        carbon = self.carbon_profile.window_carbon_many(run_starts, actual, power_kw=self.power_kw)
+        # Sequential accumulation, matching `total += c` in the scalar loop
+        if carbon.shape[1]:
+            carbon_total = np.cumsum(carbon, axis=1)[:, -1]
+        else:
+            carbon_total = np.zeros(carbon.shape[0])
+
+        _, makespan = sequential_starts(planned, longest)
+        if self.oracle:
+            fit_end = makespan
+        else:
+            _, fit_end = sequential_starts(planned, pred)
+
+        return ScheduleEvaluation(
+            carbon_total_gco2=carbon_total,
+            makespan_slots=makespan,
+            fit_end_slot=fit_end,
+        )
@@ -2,9 +2,10 @@ from typing import Optional, Dict
 from dataclasses import dataclass, field
 import pandas as pd
 
-from src.scheduler import Scheduler, assert_schedule_fits_sequential, realised_carbon_sequential
+from src.scheduler import Scheduler
 from src.carbon import CarbonProfile
 from src.workload import Workload
+from src.evaluator import ScheduleEvaluator
 
 @dataclass
 class ExperimentResult:
@@ -130,6 +131,10 @@ class SchedulerExperiment:
         oracle: bool = False,
         verbose: bool = False,
         add_variance: float = 1.0,
+        ci_cache_dir: Optional[str] = None,
+        lazy_upsample: bool = False,
+        carbon_profile: Optional[CarbonProfile] = None,
+        workload: Optional[Workload] = None,
     ):
         self.name = name
         self.label = label
@@ -141,47 +146,30 @@ class SchedulerExperiment:
         if end_time == None:
             end_time = start_time 
             
-        # Build carbon profile
-        self.carbon_profile = CarbonProfile.from_csv(
-            carbon_csv_path,
-            use_lifecycle=use_lifecycle_ci,
-            start=f"{start_date} {start_time}",
-            end=f"{end_date} {end_time}",
-            upsample_to_sec=upsample_to_sec,
-        )
+        # Build carbon profile (unless an already loaded one is supplied)
+        if carbon_profile is None:
+            carbon_profile = CarbonProfile.from_csv(
+                carbon_csv_path,
+                use_lifecycle=use_lifecycle_ci,
+                start=f"{start_date} {start_time}",
+                end=f"{end_date} {end_time}",
+                upsample_to_sec=upsample_to_sec,
+                cache_dir=ci_cache_dir,
+                lazy=lazy_upsample,
+            )
+        self.carbon_profile = carbon_profile
 
-        # Build workload
-        workload = Workload.from_values_csv(
-            values_csv_path,
-            slot_sec=upsample_to_sec,
-            limit=query_limit,
-            oracle=oracle,
-            add_variance=add_variance
-        )
+        # Build workload (unless an already loaded one is supplied)
+        if workload is None:
+            workload = Workload.from_values_csv(
+                values_csv_path,
+                slot_sec=upsample_to_sec,
+                limit=query_limit,
+                oracle=oracle,
+                add_variance=add_variance
+            )
         self.workload = workload.oracle_view() if self.oracle else workload
 
-    def _compute_makespan_slots(self, schedule) -> int:
-        """
-        Sequential, single-machine makespan under the same blocking semantics
-        as realised_carbon_sequential.
-        """
-        query_by_id = {query.id: query for query in self.workload.queries}
-        ordered_ids = sorted(schedule.keys(), key=lambda jid: schedule[jid])
-    
-        time_cursor = 0
-        for jid in ordered_ids:
-            q = query_by_id[jid]
-            planned_start = schedule[jid]
-    
-            if planned_start > time_cursor:
-                time_cursor = planned_start
-    
-            block_slots = max(q.pred_slots, q.actual_slots)
-            time_cursor += block_slots
-    
-        return time_cursor
-
-
     def run(self) -> ExperimentResult:
         """
         Run the experiment for the issued scheduler.
@@ -202,21 +190,19 @@ class SchedulerExperiment:
 
         schedule = self.scheduler.build_schedule(wl, cp)
 
-        assert_schedule_fits_sequential(
-            wl,
-            schedule,
-            cp.num_slots,
-            name=self.scheduler.name,
-        )
+        # Fit check, realised carbon and makespan in one vectorised pass;
+        # same semantics as assert_schedule_fits_sequential() and
+        # realised_carbon_sequential(), with the makespan blocking for
+        # max(pred, actual).
+        evaluation = ScheduleEvaluator(wl, cp, power_kw=self.power_kw).evaluate(schedule)
 
-        carbon_total = realised_carbon_sequential(
-            wl,
-            schedule,
-            cp,
-            power_kw=self.power_kw,
+        assert evaluation.fit_end_slot <= cp.num_slots, (
+            f"{self.scheduler.name} exceeds CI window: ends at slot {evaluation.fit_end_slot}, "
+            f"but CI length is {cp.num_slots}"
         )
 
-        makespan_slots = self._compute_makespan_slots(schedule)
+        carbon_total = evaluation.carbon_total_gco2
+        makespan_slots = evaluation.makespan_slots
         makespan_seconds = makespan_slots * cp.slot_sec
 
         print(f"Total carbon (gCO2):   {carbon_total:.2f}")
@@ -256,6 +242,8 @@ def run_scheduler_experiment(
     oracle: bool = False,
     verbose: bool = False,
     add_variance: float = 1.0,
+    ci_cache_dir: Optional[str] = None,
+    lazy_upsample: bool = False,
 ) -> ExperimentResult:
     """
     High-level entrypoint.
@@ -277,5 +265,7 @@ def run_scheduler_experiment(
         oracle=oracle,
         verbose=verbose,
         add_variance=add_variance,
+        ci_cache_dir=ci_cache_dir,
+        lazy_upsample=lazy_upsample,
     )
     return exp.run()
@@ -0,0 +1,182 @@
+import os
+from typing import Optional, Dict, List, Sequence, Tuple
+from dataclasses import dataclass, field, replace
+from concurrent.futures import ProcessPoolExecutor
+
+from src.scheduler import Scheduler, FIFOScheduler
+from src.carbon import CarbonProfile
+from src.workload import Workload
+from src.experiment import ExperimentResult, SchedulerExperiment
+
+# Per-process caches, so each worker loads a CI profile / workload only once
+_PROFILE_CACHE: Dict[tuple, CarbonProfile] = {}
+_WORKLOAD_CACHE: Dict[tuple, Workload] = {}
+
+
+@dataclass
+class SweepSpec:
+    """
+    Declarative description of an experiment grid:
+    locations x scenarios x schedulers x models.
+
+      locations  : [(location name, carbon csv path), ...]
+      scenarios  : [(scenario name, {model label: values csv path}), ...]
+      schedulers : schedulers to run in every (location, scenario) panel
+      settings   : keyword arguments forwarded to SchedulerExperiment
+                   (query_limit, use_lifecycle_ci, start_date, ci_cache_dir,
+                   lazy_upsample, ...)
+
+    FIFOScheduler instances run once with the `fifo_label` model; every other scheduler
+    runs all remaining models. The `oracle_label` model uses the oracle view.
+    """
+    locations: Sequence[Tuple[str, str]]
+    scenarios: Sequence[Tuple[str, Dict[str, str]]]
+    schedulers: Sequence[Scheduler]
+    settings: dict = field(default_factory=dict)
+    fifo_label: str = "FIFO"
+    oracle_label: str = "Oracle"
+
+    def cells(self) -> List["GridCell"]:
+        """Expand the sweep into cells, in panel order."""
+        cells = []
+        for scenario_name, values_by_label in self.scenarios:
+            for location_name, carbon_csv_path in self.locations:
+                for scheduler in self.schedulers:
+                    if isinstance(scheduler, FIFOScheduler):
+                        labels = [self.fifo_label]
+                    else:
+                        labels = [l for l in values_by_label if l != self.fifo_label]
+
+                    for label in labels:
+                        cells.append(
+                            GridCell(
+                                location=location_name,
+                                scenario=scenario_name,
+                                label=label,
+                                scheduler=scheduler,
+                                carbon_csv_path=carbon_csv_path,
+                                values_csv_path=values_by_label[label],
+                                oracle=(label == self.oracle_label),
+                            )
+                        )
+        return cells
+
+
+@dataclass(frozen=True)
+class GridCell:
+    """ One run_scheduler_experiment() call of a sweep. """
+    location: str
+    scenario: str
+    label: str
+    scheduler: Scheduler
+    carbon_csv_path: str
+    values_csv_path: str
+    oracle: bool
+
+
+def _load_carbon_profile(carbon_csv_path: str, settings: dict) -> CarbonProfile:
+    start_time = settings.get("start_time", "09:00:00")
+    end_time = settings.get("end_time") or start_time
+    key = (
+        carbon_csv_path,
+        settings.get("use_lifecycle_ci", False),
+        f"{settings.get('start_date', '2024-01-02')} {start_time}",
+        f"{settings.get('end_date', '2024-01-04')} {end_time}",
+        settings.get("upsample_to_sec", 1),
+        settings.get("lazy_upsample", False),
+    )
+    if key not in _PROFILE_CACHE:
+        _PROFILE_CACHE[key] = CarbonProfile.from_csv(
+            carbon_csv_path,
+            use_lifecycle=key[1],
+            start=key[2],
+            end=key[3],
+            upsample_to_sec=key[4],
+            cache_dir=settings.get("ci_cache_dir"),
+            lazy=key[5],
+        )
+    return _PROFILE_CACHE[key]
+
+
+def _load_workload(values_csv_path: str, settings: dict) -> Workload:
+    key = (
+        values_csv_path,
+        settings.get("upsample_to_sec", 1),
+        settings.get("query_limit"),
+        settings.get("add_variance", 1.0),
+    )
+    if key not in _WORKLOAD_CACHE:
+        _WORKLOAD_CACHE[key] = Workload.from_values_csv(
+            values_csv_path,
+            slot_sec=key[1],
+            limit=key[2],
+            add_variance=key[3],
+        )
+    return _WORKLOAD_CACHE[key]
+
+
+def run_grid_cell(cell: GridCell, settings: dict, detach: bool = False) -> ExperimentResult:
+    """
+    Run a single cell, reusing this process's cached CI profile and workload.
+
+    With `detach`, the result comes back without its carbon_profile and
+    workload, so a worker only pickles the schedule and metrics; the parent
+    re-attaches its own copies with _attach().
+    """
+    exp = SchedulerExperiment(
+        name=cell.scheduler.name,
+        label=cell.label,
+        scheduler=cell.scheduler,
+        carbon_csv_path=cell.carbon_csv_path,
+        values_csv_path=cell.values_csv_path,
+        oracle=cell.oracle,
+        carbon_profile=_load_carbon_profile(cell.carbon_csv_path, settings),
+        workload=_load_workload(cell.values_csv_path, settings),
+        power_kw=settings.get("power_kw", 0.150),
+        verbose=settings.get("verbose", False),
+    )
+    result = exp.run()
+    if detach:
+        result = replace(result, workload=None, carbon_profile=None)
+    return result
+
+
+def _attach(result: ExperimentResult, cell: GridCell, settings: dict) -> ExperimentResult:
+    workload = _load_workload(cell.values_csv_path, settings)
+    result.workload = workload.oracle_view() if cell.oracle else workload
+    result.carbon_profile = _load_carbon_profile(cell.carbon_csv_path, settings)
+    return result
+
+
+def run_grid(
+    spec: SweepSpec,
+    *,
+    max_workers: Optional[int] = None,
+) -> List[Tuple[str, str, List[ExperimentResult]]]:
+    """
+    Run every cell of `spec` across a ProcessPoolExecutor.
+
+    Returns panel configs [(location, scenario, [ExperimentResult, ...]), ...]
+    in the same shape panel_configs_to_overhead_df() consumes. Set
+    max_workers=1 to run in-process. Workers send back only schedules and
+    metrics; every result's CI profile and workload are this process's
+    cached copies, shared between cells.
+    """
+    cells = spec.cells()
+    settings = dict(spec.settings)
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    if max_workers == 1:
+        results = [run_grid_cell(cell, settings) for cell in cells]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(run_grid_cell, cell, settings, True) for cell in cells]
+            results = [_attach(f.result(), cell, settings) for cell, f in zip(cells, futures)]
+
+    panels: Dict[Tuple[str, str], List[ExperimentResult]] = {}
+    for cell, result in zip(cells, results):
+        panels.setdefault((cell.location, cell.scenario), []).append(result)
+
+    return [(location, scenario, res_list) for (location, scenario), res_list in panels.items()]
@@ -180,10 +180,12 @@ def plot_ci_over_slots(carbon_profile, max_slots=None, figsize=(10, 4)):
     Plot carbon intensity (gCO2/kWh) as a function of slot index.
     """
     ci = carbon_profile.ci
+    factor = carbon_profile.upsample_factor
     if max_slots is not None:
-        ci = ci[:max_slots]
+        ci = ci[:-(-max_slots // factor)]
 
-    x = np.arange(len(ci))
+    # Lazily upsampled profiles keep one value per `factor` slots
+    x = np.arange(len(ci)) * factor
 
     plt.figure(figsize=figsize)
     plt.plot(x, ci)
@@ -3,6 +3,8 @@ from typing import Optional, Dict
 from abc import ABC, abstractmethod
 from math import ceil
 
+import numpy as np
+
 try:
     from tqdm.auto import tqdm
 except ImportError:  
@@ -10,6 +12,7 @@ except ImportError:
 
 from src.workload import Workload
 from src.carbon import CarbonProfile
+from src.evaluator import sequential_starts
 
 def realised_carbon_sequential(workload, schedule, carbon_profile, power_kw=0.150, local_search=False):
     """
@@ -106,6 +109,7 @@ class GreedyLowCarbonDeferScheduler(Scheduler):
         name: str = "LowCarbonWhoWhen",
         candidate_step_slots: int = 1,
         show_progress: bool = False,
+        search: str = "index",
     ):
         self.search_hours = float(search_hours)
         self._name = name
@@ -115,10 +119,35 @@ class GreedyLowCarbonDeferScheduler(Scheduler):
 
         self.show_progress = show_progress
 
+        # How the best start of a query is found:
+        #   "loop"       - one window_carbon() call per candidate start
+        #   "vectorized" - all candidates of a duration in one NumPy call
+        #   "index"      - O(1) lookups in CarbonProfile.best_start()
+        if search not in ("loop", "vectorized", "index"):
+            raise ValueError(f"Unknown search '{search}'")
+        self.search = search
+
     @property
     def name(self):
         return self._name
 
+    def _best_start_vectorized(self, carbon_profile, earliest, search_end, d_pred):
+        """
+        Lowest-carbon start in range(earliest, search_end + 1, step) for a
+        query of d_pred slots. Ties go to the earliest start, as in the loop.
+        """
+        costs = carbon_profile.window_carbon_range(
+            earliest,
+            search_end + 1,
+            d_pred,
+            step=self.candidate_step_slots,
+            power_kw=0.150,
+        )
+        # NaN windows are never chosen by the scalar `c < best` comparison
+        costs = np.where(np.isnan(costs), np.inf, costs)
+        idx = int(np.argmin(costs))
+        return float(costs[idx]), earliest + idx * self.candidate_step_slots
+
     def build_schedule(self, workload, carbon_profile):
         remaining = {query.id for query in workload.queries}
         query_by_id = {query.id: query for query in workload.queries}
@@ -128,6 +157,19 @@ class GreedyLowCarbonDeferScheduler(Scheduler):
         search_range_slots = int(ceil(self.search_hours / carbon_profile.dt_hours))
         ci_len = carbon_profile.num_slots
 
+        # The index cache is an LRU capped in bytes, and every step visits
+        # every duration; if the indices of all durations don't fit, fall
+        # back to the vectorised scan rather than rebuild indices each step.
+        # Indices are per slot, so they would also undo lazy upsampling.
+        search = self.search
+        if search == "index":
+            num_durations = len({query.pred_slots for query in workload.queries})
+            if (
+                num_durations > carbon_profile.index_cache_size
+                or carbon_profile.upsample_factor > 1
+            ):
+                search = "vectorized"
+
         pbar = None
         if self.show_progress and tqdm is not None:
             pbar = tqdm(
@@ -143,6 +185,10 @@ class GreedyLowCarbonDeferScheduler(Scheduler):
             best_global_cost = float("inf")
             best_global_d_pred = None
 
+            # The search range depends only on d_pred, so queries with the
+            # same predicted duration share one evaluation per step.
+            best_by_duration = {}
+
             # For each remaining query, find its best start time within the horizon
             for jid in sorted(remaining):
                 query = query_by_id[jid]
@@ -159,19 +205,38 @@ class GreedyLowCarbonDeferScheduler(Scheduler):
 
                 search_end = min(earliest + search_range_slots, last_possible)
 
-                best_cost_for_query = float("inf")
-                best_start_for_query = earliest
-                candidate_slots = range(
-                    earliest,
-                    search_end + 1,
-                    self.candidate_step_slots,
-                )        
-
-                for s in candidate_slots:
-                    c = carbon_profile.window_carbon(s, d_pred, power_kw=0.150)
-                    if c < best_cost_for_query:
-                        best_cost_for_query = c
-                        best_start_for_query = s
+                if search == "index":
+                    if d_pred not in best_by_duration:
+                        s = carbon_profile.best_start(
+                            d_pred,
+                            earliest,
+                            search_range_slots,
+                            step=self.candidate_step_slots,
+                            power_kw=0.150,
+                        )
+                        c = carbon_profile.window_carbon(s, d_pred, power_kw=0.150)
+                        best_by_duration[d_pred] = (c, s)
+                    best_cost_for_query, best_start_for_query = best_by_duration[d_pred]
+                elif search == "vectorized":
+                    if d_pred not in best_by_duration:
+                        best_by_duration[d_pred] = self._best_start_vectorized(
+                            carbon_profile, earliest, search_end, d_pred
+                        )
+                    best_cost_for_query, best_start_for_query = best_by_duration[d_pred]
+                else:
+                    best_cost_for_query = float("inf")
+                    best_start_for_query = earliest
+                    candidate_slots = range(
+                        earliest,
+                        search_end + 1,
+                        self.candidate_step_slots,
+                    )
+
+                    for s in candidate_slots:
+                        c = carbon_profile.window_carbon(s, d_pred, power_kw=0.150)
+                        if c < best_cost_for_query:
+                            best_cost_for_query = c
+                            best_start_for_query = s
 
                 if (best_cost_for_query < best_global_cost) or (
                         best_cost_for_query == best_global_cost and jid < best_global_query
@@ -193,6 +258,257 @@ class GreedyLowCarbonDeferScheduler(Scheduler):
 
         return schedule
 
+class IncrementalGreedyLowCarbonDeferScheduler(GreedyLowCarbonDeferScheduler):
+    """
+    Incremental formulation of GreedyLowCarbonDeferScheduler; produces the
+    same schedule.
+
+    Only current_slot changes between placements, and queries with the same
+    pred_slots always share a best start. Each duration therefore keeps one
+    entry (best_cost, jid, best_start), where jid is its lowest remaining id.
+    An entry is re-scored over the whole search range only when its best start
+    fell behind the cursor or the candidate grid shifted; otherwise only the
+    candidates newly exposed at the end of the range are scored.
+    """
+
+    def __init__(
+        self,
+        search_hours: float = 24.0,
+        name: str = "LowCarbonWhoWhen (incremental)",
+        candidate_step_slots: int = 1,
+        show_progress: bool = False,
+    ):
+        super().__init__(
+            search_hours=search_hours,
+            name=name,
+            candidate_step_slots=candidate_step_slots,
+            show_progress=show_progress,
+            search="vectorized",
+        )
+
+    def build_schedule(self, workload, carbon_profile):
+        step = self.candidate_step_slots
+        search_range_slots = int(ceil(self.search_hours / carbon_profile.dt_hours))
+        ci_len = carbon_profile.num_slots
+
+        # pred_slots -> remaining query ids, lowest (tie-winning) id last
+        ids_by_duration = {}
+        for query in workload.queries:
+            ids_by_duration.setdefault(query.pred_slots, []).append(query.id)
+        for ids in ids_by_duration.values():
+            ids.sort(reverse=True)
+
+        # pred_slots -> (best_cost, best_start, earliest, search_end) of the last scoring
+        entries = {}
+        schedule = {}
+        current_slot = 0
+
+        pbar = None
+        if self.show_progress and tqdm is not None:
+            pbar = tqdm(
+                total=len(workload.queries),
+                desc=f"{self.name} (queries)",
+                unit="query",
+                leave=False,
+            )
+
+        while ids_by_duration:
+            candidates = []
+
+            for d_pred, ids in ids_by_duration.items():
+                earliest = current_slot
+                fits = current_slot < ci_len and ci_len - d_pred >= earliest
+
+                if not fits:
+                    # Single (truncated) candidate at the cursor
+                    entry = (*self._best_start_vectorized(
+                        carbon_profile, earliest, earliest, d_pred
+                    ), earliest, earliest)
+                else:
+                    search_end = min(earliest + search_range_slots, ci_len - d_pred)
+                    entry = entries.get(d_pred)
+
+                    if (
+                        entry is not None
+                        and entry[1] >= earliest
+                        and (earliest - entry[2]) % step == 0
+                        and np.isfinite(entry[0])
+                    ):
+                        best_cost, best_start, prev_earliest, prev_end = entry
+                        # Next grid point after the previously scored range
+                        first_new = prev_earliest + ((prev_end - prev_earliest) // step + 1) * step
+                        if first_new <= search_end:
+                            tail_cost, tail_start = self._best_start_vectorized(
+                                carbon_profile, first_new, search_end, d_pred
+                            )
+                            # Ties keep the earlier start
+                            if tail_cost < best_cost:
+                                best_cost, best_start = tail_cost, tail_start
+                        entry = (best_cost, best_start, earliest, search_end)
+                    else:
+                        entry = (*self._best_start_vectorized(
+                            carbon_profile, earliest, search_end, d_pred
+                        ), earliest, search_end)
+
+                entries[d_pred] = entry
+                candidates.append((entry[0], ids[-1], entry[1], d_pred))
+
+            best_cost, best_query, best_start, best_d_pred = min(candidates)
+
+            schedule[best_query] = best_start
+            current_slot = best_start + best_d_pred
+
+            ids = ids_by_duration[best_d_pred]
+            ids.pop()
+            if not ids:
+                del ids_by_duration[best_d_pred]
+                del entries[best_d_pred]
+
+            if pbar is not None:
+                pbar.update(1)
+
+        if pbar is not None:
+            pbar.close()
+
+        return schedule
+
+class LocalSearchScheduler(Scheduler):
+    """
+    Local search over a sequential plan, seeded from another scheduler
+    (FIFO by default, or e.g. the greedy deferral scheduler).
+
+    The plan is a query order plus a release slot per position; each query
+    starts at max(release, end of the previous query), blocking for
+    pred_slots. Moves are
+      - swap  (probability swap_prob): exchange the queries at two positions
+      - shift : move one position's release by up to +/- max_shift_slots
+    and are kept only if they lower the predicted carbon.
+
+    Moves are scored incrementally: the timeline is re-scanned and re-costed
+    from the first changed position only until it re-joins the old timeline,
+    using the prefix sums behind CarbonProfile.window_carbon_many().
+    """
+
+    def __init__(
+        self,
+        name: str = "Local Search",
+        seed_scheduler: Optional[Scheduler] = None,
+        swap_prob: float = 0.5,
+        max_iters: int = 5000,
+        max_shift_slots: int = 86400,
+        random_seed: int = 0,
+        show_progress: bool = False,
+    ):
+        self._name = name
+        self.seed_scheduler = seed_scheduler if seed_scheduler is not None else FIFOScheduler()
+        if not 0.0 <= swap_prob <= 1.0:
+            raise ValueError("swap_prob must be in [0, 1]")
+        self.swap_prob = float(swap_prob)
+        self.max_iters = int(max_iters)
+        self.max_shift_slots = int(max_shift_slots)
+        self.random_seed = random_seed
+        self.show_progress = show_progress
+
+    @property
+    def name(self):
+        return self._name
+
+    def build_schedule(self, workload, carbon_profile):
+        rng = random.Random(self.random_seed)
+        ci_len = carbon_profile.num_slots
+
+        # Seed plan: seed schedule's order, with its starts as releases
+        seed = self.seed_scheduler.build_schedule(workload, carbon_profile)
+        query_by_id = {query.id: query for query in workload.queries}
+        ids = sorted(seed.keys(), key=lambda jid: seed[jid])
+        n = len(ids)
+        if n < 2:
+            return dict(seed)
+
+        order = np.arange(n)
+        release = np.array([seed[jid] for jid in ids], dtype=np.int64)
+        pred = np.array([query_by_id[jid].pred_slots for jid in ids], dtype=np.int64)
+
+        starts, end_slot = sequential_starts(release, pred[order])
+        costs = carbon_profile.window_carbon_many(starts, pred[order], power_kw=0.150)
+
+        pbar = None
+        if self.show_progress and tqdm is not None:
+            pbar = tqdm(
+                total=self.max_iters,
+                desc=f"{self.name} (iterations)",
+                unit="iter",
+                leave=False,
+            )
+
+        for _ in range(self.max_iters):
+            new_order = order
+            new_release = release
+
+            if rng.random() < self.swap_prob:
+                i, j = sorted(rng.sample(range(n), 2))
+                new_order = order.copy()
+                new_order[i], new_order[j] = order[j], order[i]
+                last_changed = j
+            else:
+                i = rng.randrange(n)
+                shifted = max(0, int(release[i]) + rng.randint(-self.max_shift_slots, self.max_shift_slots))
+                if shifted == release[i]:
+                    if pbar is not None:
+                        pbar.update(1)
+                    continue
+                new_release = release.copy()
+                new_release[i] = shifted
+                last_changed = i
+
+            # Re-scan from position i, starting after query i-1. Past the last
+            # changed position only the cursor differs, and the timeline is
+            # unchanged from the first position whose start is unchanged, so
+            # scan in doubling chunks until that position.
+            cursor = starts[i - 1] + pred[order[i - 1]] if i > 0 else 0
+            tail = last_changed + 1
+            lo, hi = i, min(n, tail + 64)
+            pieces = []
+            while True:
+                planned = new_release[lo:hi].copy()
+                planned[0] = max(planned[0], cursor)
+                chunk_starts, cursor = sequential_starts(planned, pred[new_order[lo:hi]])
+                check = max(tail, lo)
+                same = np.flatnonzero(chunk_starts[check - lo:] == starts[check:hi])
+                if len(same):
+                    stop = check + int(same[0])
+                    pieces.append(chunk_starts[:stop - lo])
+                    break
+                pieces.append(chunk_starts)
+                if hi == n:
+                    stop = n
+                    break
+                lo, hi = hi, min(n, hi + 2 * (hi - lo))
+            new_starts = pieces[0] if len(pieces) == 1 else np.concatenate(pieces)
+            durations = pred[new_order[i:stop]]
+            new_end = cursor if stop == n else end_slot
+
+            if new_end > max(end_slot, ci_len):
+                if pbar is not None:
+                    pbar.update(1)
+                continue
+
+            new_costs = carbon_profile.window_carbon_many(new_starts, durations, power_kw=0.150)
+            if new_costs.sum() < costs[i:stop].sum():
+                order = new_order
+                release = new_release
+                starts[i:stop] = new_starts
+                costs[i:stop] = new_costs
+                end_slot = new_end
+
+            if pbar is not None:
+                pbar.update(1)
+
+        if pbar is not None:
+            pbar.close()
+
+        return {ids[q]: int(s) for q, s in zip(order, starts)}
+
 def assert_schedule_fits_sequential(
     workload: Workload,
     schedule: Dict[str, int],
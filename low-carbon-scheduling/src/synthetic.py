@@ -0,0 +1,163 @@
+import ast
+from typing import Callable, Iterator, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from src.workload import ColumnarWorkload, runtimes_to_slots
+
+# z-score of the 99th percentile of a standard normal
+_Z99 = 2.3263478740408408
+
+CVSpec = Union[float, Sequence[float], np.ndarray, Callable]
+
+
+def load_runtime_pairs(path: str):
+    """
+    (prediction, label) runtime arrays in seconds from a model result CSV.
+
+    Accepts RF values.csv files ('prediction', 'label' columns) and GNN
+    test_*.csv files ('val_preds', 'val_labels' list columns, first row).
+    Pairs with a non-positive or non-finite runtime are dropped, as in
+    table3.ipynb.
+    """
+    df = pd.read_csv(path)
+
+    if {"prediction", "label"}.issubset(df.columns):
+        pred = df["prediction"].to_numpy(dtype=float)
+        label = df["label"].to_numpy(dtype=float)
+    elif {"val_preds", "val_labels"}.issubset(df.columns):
+        pred = np.asarray(ast.literal_eval(df.loc[0, "val_preds"]), dtype=float)
+        label = np.asarray(ast.literal_eval(df.loc[0, "val_labels"]), dtype=float)
+    else:
+        raise ValueError(f"{path}: expected 'prediction'/'label' or 'val_preds'/'val_labels' columns")
+
+    mask = np.isfinite(pred) & np.isfinite(label) & (pred > 0) & (label > 0)
+    return pred[mask], label[mask]
+
+
+def lognormal_cv_sampler(cv_p50_pct: float, cv_p99_pct: float) -> Callable:
+    """
+    Sampler of per-query CVs (as fractions) from a log-normal matched to the
+    P50 and P99 CV (in %), e.g. the 'CV P50 (%)' / 'CV P99 (%)' columns of
+    summarize_single_config().
+    """
+    if cv_p50_pct <= 0:
+        return lambda rng, n: np.zeros(n)
+
+    mu = np.log(cv_p50_pct / 100.0)
+    sigma = max(0.0, np.log(cv_p99_pct / cv_p50_pct) / _Z99) if cv_p99_pct > 0 else 0.0
+    return lambda rng, n: rng.lognormal(mu, sigma, size=n)
+
+
+def cv_sampler_from_summary(summary: pd.DataFrame) -> Callable:
+    """
+    lognormal_cv_sampler() for the first row of a summarize_single_config() result.
+    """
+    row = summary.iloc[0]
+    return lognormal_cv_sampler(float(row["CV P50 (%)"]), float(row["CV P99 (%)"]))
+
+
+class SyntheticWorkloadGenerator:
+    """
+    Generates large columnar workloads by resampling (prediction, label)
+    pairs from model result files and injecting run-to-run variance into the
+    actual runtimes.
+
+    Each query draws a pair with replacement and a CV; its actual runtime is
+    label * noise, with log-normal noise of mean 1 and that CV. Predictions
+    are left as the model produced them.
+
+    `cv` is either
+      - a float              : the same CV (fraction) for every query,
+      - an array of CVs      : resampled empirically per query,
+      - a callable(rng, n)   : returning n CVs, e.g. lognormal_cv_sampler().
+    """
+
+    def __init__(
+        self,
+        pred_seconds,
+        label_seconds,
+        slot_sec: int = 1,
+        cv: CVSpec = 0.0,
+        random_seed: int = 0,
+        oracle: bool = False,
+        id_prefix: str = "q",
+    ):
+        self.pred_seconds = np.asarray(pred_seconds, dtype=float)
+        self.label_seconds = np.asarray(label_seconds, dtype=float)
+        if len(self.pred_seconds) != len(self.label_seconds):
+            raise ValueError("pred_seconds and label_seconds must have the same length")
+        if len(self.pred_seconds) == 0:
+            raise ValueError("No runtime pairs to resample from")
+
+        self.slot_sec = slot_sec
+        self.cv = cv
+        self.random_seed = random_seed
+        self.oracle = oracle
+        self.id_prefix = id_prefix
+
+    @classmethod
+    def from_result_files(cls, paths: Union[str, Sequence[str]], **kwargs):
+        """
+        Pool the runtime pairs of one or more RF values.csv / GNN test_*.csv files.
+        """
+        if isinstance(paths, str):
+            paths = [paths]
+
+        pairs = [load_runtime_pairs(p) for p in paths]
+        return cls(
+            np.concatenate([p for p, _ in pairs]),
+            np.concatenate([l for _, l in pairs]),
+            **kwargs,
+        )
+
+    def _sample_cv(self, rng, n: int) -> np.ndarray:
+        if callable(self.cv):
+            return np.asarray(self.cv(rng, n), dtype=float)
+        if np.ndim(self.cv) == 0:
+            return np.full(n, float(self.cv))
+        return rng.choice(np.asarray(self.cv, dtype=float), size=n)
+
+    def chunks(self, num_queries: int, chunk_size: int = 100_000) -> Iterator[ColumnarWorkload]:
+        """
+        Stream `num_queries` queries as ColumnarWorkload chunks of at most
+        `chunk_size`. Query ids run on across chunks; the same seed and
+        chunk_size give the same queries.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+
+        rng = np.random.default_rng(self.random_seed)
+        for offset in range(0, num_queries, chunk_size):
+            n = min(chunk_size, num_queries - offset)
+
+            idx = rng.integers(0, len(self.label_seconds), size=n)
+            cv = self._sample_cv(rng, n)
+
+            # Log-normal with E[noise] = 1 and std = cv
+            sigma = np.sqrt(np.log1p(np.square(cv)))
+            noise = np.exp(rng.standard_normal(n) * sigma - 0.5 * np.square(sigma))
+
+            ids = np.char.add(self.id_prefix, np.arange(offset, offset + n).astype(str))
+            yield ColumnarWorkload(
+                ids,
+                runtimes_to_slots(self.pred_seconds[idx], self.slot_sec),
+                runtimes_to_slots(self.label_seconds[idx] * noise, self.slot_sec),
+                self.oracle,
+            )
+
+    def generate(self, num_queries: int, chunk_size: int = 100_000) -> ColumnarWorkload:
+        """
+        Materialise chunks() into a single ColumnarWorkload.
+        """
+        parts = list(self.chunks(num_queries, chunk_size))
+        if not parts:
+            return ColumnarWorkload(np.array([], dtype=str), [], [], self.oracle)
+
+        return ColumnarWorkload(
+            np.concatenate([p.ids for p in parts]),
+            np.concatenate([p.pred_slots for p in parts]),
+            np.concatenate([p.actual_slots for p in parts]),
+            self.oracle,
+        )
@@ -2,6 +2,7 @@ import random
 from typing import Optional, Callable
 from dataclasses import dataclass
 from math import ceil
+import numpy as np
 import pandas as pd
 
 @dataclass(frozen=True)
@@ -65,6 +66,7 @@ class Workload:
     def ordered_queries(
         self,
         order_policy: Optional[Callable] | str = "arrival",
+        random_seed: int = 0,
     ):
         """
         Return a list of queries ordered according to `order_policy`.
@@ -110,8 +112,131 @@ class Workload:
 
         # 5) Random ordering (but reproducible via seed)
         if policy == "random":
-            rng = random.Random(0)
+            rng = random.Random(random_seed)
             rng.shuffle(queries_list)
             return queries_list
 
         raise ValueError(f"Unknown order_policy '{order_policy}'")
+
+
+def runtimes_to_slots(runtime_seconds, slot_sec, add_variance=1.0):
+    """
+    Vectorised runtime_to_slots() over an array of runtimes in seconds.
+    """
+    slots = np.trunc(np.ceil(np.asarray(runtime_seconds, dtype=float) / float(slot_sec)) * add_variance)
+    return np.maximum(1, slots).astype(np.int64)
+
+
+class ColumnarWorkload(Workload):
+    """
+    Array-backed Workload: ids, pred_slots and actual_slots are NumPy arrays.
+
+    Orderings are exposed as index permutations (order_indices); the
+    `queries` list is only materialised on first access, for code that still
+    iterates query objects.
+    """
+
+    def __init__(self, ids, pred_slots, actual_slots, oracle):
+        self.ids = np.asarray(ids)
+        self.pred_slots = np.asarray(pred_slots, dtype=np.int64)
+        self.actual_slots = np.asarray(actual_slots, dtype=np.int64)
+        self.oracle = oracle
+        self._queries = None
+
+    @classmethod
+    def from_values_csv(cls, values_csv_path, slot_sec, limit: Optional[int] = None, oracle=False, add_variance=1.0):
+        """
+        values.csv must have columns: 'prediction', 'label' (seconds).
+        """
+        # Only the first `limit` rows are parsed
+        df = pd.read_csv(values_csv_path, usecols=["prediction", "label"], nrows=limit)
+
+        ids = np.char.add("q", np.arange(len(df)).astype(str))
+        return cls(
+            ids,
+            runtimes_to_slots(df["prediction"].to_numpy(), slot_sec, add_variance),
+            runtimes_to_slots(df["label"].to_numpy(), slot_sec),
+            oracle,
+        )
+
+    @classmethod
+    def from_workload(cls, workload):
+        """
+        Columnar copy of a list-backed Workload.
+        """
+        return cls(
+            [q.id for q in workload.queries],
+            [q.pred_slots for q in workload.queries],
+            [q.actual_slots for q in workload.queries],
+            workload.oracle,
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def queries(self):
+        if self._queries is None:
+            self._queries = [
+                query(id=str(i), pred_slots=int(p), actual_slots=int(a))
+                for i, p, a in zip(self.ids, self.pred_slots, self.actual_slots)
+            ]
+        return self._queries
+
+    def oracle_view(self):
+        """
+        Return a workload where pred_slots = actual_slots for all queries
+        (perfect predictor).
+        """
+        return ColumnarWorkload(self.ids, self.actual_slots, self.actual_slots, True)
+
+    def order_indices(
+        self,
+        order_policy: Optional[Callable] | str = "arrival",
+        random_seed: int = 0,
+    ) -> np.ndarray:
+        """
+        Index permutation for `order_policy`; same orderings as ordered_queries().
+        Sorts are stable, as Python's sorted() is.
+        """
+        n = len(self.ids)
+
+        if callable(order_policy):
+            queries_list = self.queries
+            return np.array(sorted(range(n), key=lambda i: order_policy(queries_list[i])), dtype=np.int64)
+
+        policy = "arrival" if order_policy is None else str(order_policy).lower()
+        error = np.abs(self.actual_slots - self.pred_slots)
+
+        if policy == "arrival":
+            return np.arange(n)
+        if policy == "pred_longest_first":
+            return np.argsort(-self.pred_slots, kind="stable")
+        if policy == "pred_shortest_first":
+            return np.argsort(self.pred_slots, kind="stable")
+        if policy == "actual_longest_first":
+            return np.argsort(-self.actual_slots, kind="stable")
+        if policy == "actual_shortest_first":
+            return np.argsort(self.actual_slots, kind="stable")
+        if policy == "high_error_first":
+            return np.argsort(-error, kind="stable")
+        if policy == "low_error_first":
+            return np.argsort(error, kind="stable")
+        if policy == "random":
+            # Shuffling indices with the same RNG gives the same permutation
+            perm = list(range(n))
+            random.Random(random_seed).shuffle(perm)
+            return np.array(perm, dtype=np.int64)
+
+        raise ValueError(f"Unknown order_policy '{order_policy}'")
+
+    def ordered_queries(
+        self,
+        order_policy: Optional[Callable] | str = "arrival",
+        random_seed: int = 0,
+    ):
+        """
+        Return a list of queries ordered according to `order_policy`.
+        """
+        queries_list = self.queries
+        return [queries_list[i] for i in self.order_indices(order_policy, random_seed)]
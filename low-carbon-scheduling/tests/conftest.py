@@ -0,0 +1,39 @@
+import glob
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Tests import the package as `src`, like the notebooks do
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+RF_VALUES_CSV = os.path.join(ROOT, "..", "models", "RF", "Results", "Baseline_TPCDS", "values.csv")
+RF_VALUES_CSVS = sorted(glob.glob(os.path.join(ROOT, "..", "models", "RF", "Results", "*", "values.csv")))
+
+
+@pytest.fixture
+def rf_values_csv():
+    return RF_VALUES_CSV
+
+
+@pytest.fixture
+def ci_csv(tmp_path):
+    """
+    Two days of 5-minute carbon intensity in the Electricity Maps layout.
+    The real CI_data files are not shipped (see CI_data/README.md).
+    """
+    rng = np.random.default_rng(0)
+    n = 2 * 24 * 12
+    hours = np.arange(n) / 12.0
+    direct = 300 + 120 * np.sin(2 * np.pi * hours / 24) + rng.normal(0, 15, n)
+    df = pd.DataFrame({
+        "Datetime (UTC)": pd.date_range("2024-11-09", periods=n, freq="5min"),
+        "Carbon intensity gCO₂eq/kWh (direct)": np.round(direct, 2),
+        "Carbon intensity gCO₂eq/kWh (Life cycle)": np.round(direct * 1.2, 2),
+    })
+    path = tmp_path / "XX_2024_5_minute.csv"
+    df.to_csv(path, index=False)
+    return str(path)
@@ -0,0 +1,29 @@
+import numpy as np
+
+from src.carbon import CarbonProfile
+
+
+def test_best_start_index_cache_is_capped_in_bytes(ci_csv):
+    profile = CarbonProfile.from_csv(ci_csv, upsample_to_sec=10)
+    index_nbytes = 4 * profile.num_slots
+    profile.index_cache_bytes = 3 * index_nbytes
+    assert profile.index_cache_size == 3
+
+    horizon = 3600
+    for duration in range(1, 9):
+        for earliest in (0, 1000, profile.num_slots - horizon - duration):
+            costs = profile.window_carbon_range(earliest, earliest + horizon + 1, duration)
+            assert profile.best_start(duration, earliest, horizon) == earliest + int(np.argmin(costs))
+        assert len(profile._best_start_indices) <= 3
+        assert profile._index_cache_nbytes <= profile.index_cache_bytes
+
+    assert list(profile._best_start_indices) == [(d, horizon, 1, 0.15) for d in (6, 7, 8)]
+
+
+def test_oversized_index_is_still_served(ci_csv):
+    profile = CarbonProfile.from_csv(ci_csv, upsample_to_sec=10)
+    profile.index_cache_bytes = 1
+    assert profile.index_cache_size == 0
+
+    assert profile.best_start(5, 0, 600) == int(np.argmin(profile.window_carbon_range(0, 601, 5)))
+    assert len(profile._best_start_indices) == 1
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from src.carbon import CarbonProfile
+from src.evaluator import ScheduleEvaluator
+from src.scheduler import FIFOScheduler, GreedyLowCarbonDeferScheduler, realised_carbon_sequential
+from src.workload import Workload
+
+
+def makespan_slots(workload, schedule):
+    """
+    Per-schedule makespan as SchedulerExperiment computed it before the
+    evaluator: queries in planned order, blocking for max(pred, actual).
+    """
+    query_by_id = {query.id: query for query in workload.queries}
+    time_cursor = 0
+    for jid in sorted(schedule, key=lambda jid: schedule[jid]):
+        q = query_by_id[jid]
+        time_cursor = max(time_cursor, schedule[jid]) + max(q.pred_slots, q.actual_slots)
+    return time_cursor
+
+
+@pytest.mark.parametrize("local_search", [False, True])
+def test_evaluator_matches_per_schedule_metrics(rf_values_csv, ci_csv, local_search):
+    profile = CarbonProfile.from_csv(ci_csv, upsample_to_sec=10)
+    workload = Workload.from_values_csv(rf_values_csv, slot_sec=10, limit=60)
+
+    schedules = [
+        FIFOScheduler().build_schedule(workload, profile),
+        GreedyLowCarbonDeferScheduler(search_hours=4).build_schedule(workload, profile),
+    ]
+    # Random starts, with collisions so equal-start ordering is exercised
+    rng = np.random.default_rng(0)
+    for _ in range(4):
+        starts = rng.integers(0, 2000, len(workload.queries)) // 50 * 50
+        schedules.append({q.id: int(s) for q, s in zip(workload.queries, starts)})
+
+    evaluator = ScheduleEvaluator(workload, profile, local_search=local_search)
+    batch = evaluator.evaluate_batch(schedules)
+
+    for i, schedule in enumerate(schedules):
+        carbon = realised_carbon_sequential(workload, schedule, profile, local_search=local_search)
+        makespan = makespan_slots(workload, schedule)
+        single = evaluator.evaluate(schedule)
+
+        assert single.makespan_slots == makespan
+        assert batch.makespan_slots[i] == makespan
+        assert single.carbon_total_gco2 == pytest.approx(carbon, rel=1e-12)
+        assert batch.carbon_total_gco2[i] == pytest.approx(carbon, rel=1e-12)
@@ -0,0 +1,52 @@
+import pickle
+
+from src.grid import SweepSpec, run_grid, run_grid_cell
+from src.scheduler import FIFOScheduler, GreedyLowCarbonDeferScheduler
+
+
+def test_cells_detect_fifo_by_type_not_name():
+    spec = SweepSpec(
+        locations=[("GB", "gb.csv")],
+        scenarios=[("Baseline", {"FIFO": "fifo.csv", "RF": "rf.csv", "Oracle": "oracle.csv"})],
+        schedulers=[
+            FIFOScheduler(name="Arrival order"),
+            GreedyLowCarbonDeferScheduler(name="Greedy after FIFO seed"),
+        ],
+    )
+
+    labels = [(cell.scheduler.name, cell.label, cell.oracle) for cell in spec.cells()]
+
+    assert labels == [
+        ("Arrival order", "FIFO", False),
+        ("Greedy after FIFO seed", "RF", False),
+        ("Greedy after FIFO seed", "Oracle", True),
+    ]
+
+
+def test_run_grid_workers_return_detached_results(rf_values_csv, ci_csv):
+    spec = SweepSpec(
+        locations=[("XX", ci_csv)],
+        scenarios=[("Baseline", {"FIFO": rf_values_csv, "RF": rf_values_csv, "Oracle": rf_values_csv})],
+        schedulers=[FIFOScheduler(), GreedyLowCarbonDeferScheduler(search_hours=2)],
+        settings={
+            "start_date": "2024-11-09", "end_date": "2024-11-10", "start_time": "00:00:00",
+            "upsample_to_sec": 10, "query_limit": 20,
+        },
+    )
+
+    # A detached result pickles without the profile and workload
+    cell = spec.cells()[1]
+    detached = run_grid_cell(cell, spec.settings, detach=True)
+    assert detached.carbon_profile is None and detached.workload is None
+    assert len(pickle.dumps(detached)) < len(pickle.dumps(run_grid_cell(cell, spec.settings))) / 10
+
+    in_process = run_grid(spec, max_workers=1)
+    pooled = run_grid(spec, max_workers=2)
+
+    assert [(loc, scen) for loc, scen, _ in pooled] == [(loc, scen) for loc, scen, _ in in_process]
+    for (_, _, expected), (_, _, actual) in zip(in_process, pooled):
+        assert [r.summary() for r in actual] == [r.summary() for r in expected]
+        assert [r.schedule for r in actual] == [r.schedule for r in expected]
+        assert [r.workload.oracle for r in actual] == [r.workload.oracle for r in expected]
+        # Re-attached from the parent's cache, one profile for every cell
+        assert len({id(r.carbon_profile) for r in actual}) == 1
@@ -0,0 +1,31 @@
+import numpy as np
+
+from src.carbon import CarbonProfile
+from src.scheduler import FIFOScheduler, LocalSearchScheduler
+from src.workload import Workload
+
+
+def _predicted_carbon(workload, schedule, profile):
+    pred = {q.id: q.pred_slots for q in workload.queries}
+    return sum(profile.window_carbon(s, pred[jid]) for jid, s in schedule.items())
+
+
+def test_local_search_keeps_a_valid_sequential_plan(rf_values_csv, ci_csv):
+    profile = CarbonProfile.from_csv(ci_csv, upsample_to_sec=10)
+    workload = Workload.from_values_csv(rf_values_csv, slot_sec=10, limit=300)
+
+    seed = FIFOScheduler().build_schedule(workload, profile)
+    schedule = LocalSearchScheduler(
+        max_iters=2000, max_shift_slots=3000, random_seed=3
+    ).build_schedule(workload, profile)
+
+    # Incrementally tracked starts must still block for pred_slots, back-to-back
+    pred = {q.id: q.pred_slots for q in workload.queries}
+    ordered = sorted(schedule, key=schedule.get)
+    starts = np.array([schedule[jid] for jid in ordered])
+    blocks = np.array([pred[jid] for jid in ordered])
+    assert sorted(schedule) == sorted(seed)
+    assert (starts[1:] >= starts[:-1] + blocks[:-1]).all()
+    assert starts[-1] + blocks[-1] <= profile.num_slots
+
+    assert _predicted_carbon(workload, schedule, profile) < _predicted_carbon(workload, seed, profile)
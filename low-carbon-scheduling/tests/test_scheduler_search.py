@@ -0,0 +1,32 @@
+import os
+
+import pytest
+
+from conftest import RF_VALUES_CSVS
+from src.carbon import CarbonProfile
+from src.scheduler import GreedyLowCarbonDeferScheduler, IncrementalGreedyLowCarbonDeferScheduler
+from src.workload import Workload
+
+
+@pytest.mark.parametrize("step", [1, 7])
+@pytest.mark.parametrize(
+    "values_csv", RF_VALUES_CSVS, ids=[os.path.basename(os.path.dirname(p)) for p in RF_VALUES_CSVS]
+)
+def test_defer_search_modes_pick_identical_starts(values_csv, ci_csv, step):
+    profile = CarbonProfile.from_csv(ci_csv, upsample_to_sec=10)
+    workload = Workload.from_values_csv(values_csv, slot_sec=10, limit=60)
+
+    schedules = {
+        search: GreedyLowCarbonDeferScheduler(
+            search_hours=4, candidate_step_slots=step, search=search
+        ).build_schedule(workload, profile)
+        for search in ("loop", "vectorized", "index")
+    }
+    schedules["incremental"] = IncrementalGreedyLowCarbonDeferScheduler(
+        search_hours=4, candidate_step_slots=step
+    ).build_schedule(workload, profile)
+
+    assert len(schedules["loop"]) == 60
+    assert schedules["vectorized"] == schedules["loop"]
+    assert schedules["index"] == schedules["loop"]
+    assert schedules["incremental"] == schedules["loop"]
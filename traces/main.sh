@@ -5,12 +5,13 @@ set -euo pipefail
 
 BASE_DIR="."
 DRY="1"
+PY="0"
 
 STEPS=()
 
 print_usage() {
   cat <<EOF
-Usage: $0 [--base <dir>] [--dry <0|1>] [--zip] [--unzip] [--scrub] [--summary]
+Usage: $0 [--base <dir>] [--dry <0|1>] [--zip] [--unzip] [--scrub] [--summary] [--py]
 
 Options:
   --base <dir>     Base directory containing study_*/<cluster> dirs (default: .)
@@ -19,6 +20,8 @@ Options:
   --unzip          Run unzip step
   --scrub          Run scrub step
   --summary        Run workload-log generation step
+  --py             Scrub/summarise with tools/reduce_traces.py (one pass per file,
+                   process pool) instead of jq; "--scrub --summary" is one pass
   -h, --help       Show this help
 
 Order:
@@ -52,6 +55,10 @@ while [[ $# -gt 0 ]]; do
       STEPS+=("summary")
       shift
       ;;
+    --py)
+      PY="1"
+      shift
+      ;;
     -h|--help)
       print_usage
       exit 0
@@ -80,6 +87,7 @@ SCRUB_SH="$TOOLS_DIR/scrub_lakehouse_traces.sh"
 MAKELOG_SH="$TOOLS_DIR/make_lakehouse_workload_logs.sh"
 ZIP_SH="$TOOLS_DIR/zip_lakehouse_traces.sh"
 UNZIP_SH="$TOOLS_DIR/unzip_lakehouse_traces.sh"
+REDUCE_PY="$TOOLS_DIR/reduce_traces.py"
 
 require_file() {
   local f="$1"
@@ -92,8 +100,9 @@ require_file() {
 # Validate required tool files based on requested steps
 for step in "${STEPS[@]}"; do
   case "$step" in
-    scrub)   require_file "$SCRUB_SH"; require_file "$SCRUB_FILTER" ;;
-    summary) require_file "$MAKELOG_SH" ;;
+    scrub|summary) [[ "$PY" == "1" ]] && require_file "$REDUCE_PY" ;;&
+    scrub)   [[ "$PY" == "1" ]] || { require_file "$SCRUB_SH"; require_file "$SCRUB_FILTER"; } ;;
+    summary) [[ "$PY" == "1" ]] || require_file "$MAKELOG_SH" ;;
     zip)     require_file "$ZIP_SH" ;;
     unzip)   require_file "$UNZIP_SH" ;;
     *) echo "ERROR: invalid internal step: $step" >&2; exit 1 ;;
@@ -115,6 +124,7 @@ is_ignored() {
 echo "Base: $BASE_DIR"
 echo "Tools: $TOOLS_DIR"
 echo "Dry run: $DRY"
+echo "Python reducer: $PY"
 echo "Steps (in CLI order): ${STEPS[*]}"
 echo "Ignore: ${IGNORE[*]:-(none)}"
 echo
@@ -128,19 +138,35 @@ run_steps_for_cluster() {
   export DRY_RUN="$DRY"
 
   local idx=1
-  for step in "${STEPS[@]}"; do
+  local i step next
+  for ((i = 0; i < ${#STEPS[@]}; i++)); do
+    step="${STEPS[$i]}"
+    next="${STEPS[$((i + 1))]:-}"
     case "$step" in
       unzip)
         echo "-- $idx) Unzip"
         bash "$UNZIP_SH" "$cluster_dir" "$DRY"
         ;;
       scrub)
-        echo "-- $idx) Scrub"
-        bash "$SCRUB_SH" "$cluster_dir" "$DRY" "$SCRUB_FILTER"
+        if [[ "$PY" == "1" && "$next" == "summary" ]]; then
+          echo "-- $idx) Scrub + Summary (workload logs)"
+          python3 "$REDUCE_PY" "$cluster_dir" "$DRY" --scrub --summary
+          i=$((i + 1))
+        elif [[ "$PY" == "1" ]]; then
+          echo "-- $idx) Scrub"
+          python3 "$REDUCE_PY" "$cluster_dir" "$DRY" --scrub
+        else
+          echo "-- $idx) Scrub"
+          bash "$SCRUB_SH" "$cluster_dir" "$DRY" "$SCRUB_FILTER"
+        fi
         ;;
       summary)
         echo "-- $idx) Summary (workload logs)"
-        bash "$MAKELOG_SH" "$cluster_dir" "$DRY"
+        if [[ "$PY" == "1" ]]; then
+          python3 "$REDUCE_PY" "$cluster_dir" "$DRY" --summary
+        else
+          bash "$MAKELOG_SH" "$cluster_dir" "$DRY"
+        fi
         ;;
       zip)
         echo "-- $idx) Zip"
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Notebooks import the tools as top-level modules (from helpers import ...)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tools"))
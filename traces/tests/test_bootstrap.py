@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers import bootstrap_single_config
+
+CV = 0.10
+
+
+@pytest.fixture
+def config_df():
+    # 300 queries x 5 runs; every query's runtimes have a CV of 10%
+    rng = np.random.default_rng(7)
+    base = rng.lognormal(mean=1.0, sigma=0.3, size=300)
+    rows = [
+        {"database": f"run{r}", "query_id": f"q{q + 1}", "Runtime (s)": base[q] * (1.0 + CV * rng.standard_normal())}
+        for r in range(1, 6)
+        for q in range(300)
+    ]
+    return pd.DataFrame(rows)
+
+
+def test_interval_covers_estimate(config_df):
+    out = bootstrap_single_config(config_df, n_boot=2000, random_seed=1)
+
+    assert (out["CI Low"] <= out["Estimate"]).all(), out
+    assert (out["Estimate"] <= out["CI High"]).all(), out
+
+    # Resampling queries keeps each query's runs, so the std/CV replicates
+    # are centred on the estimate
+    for metric in ("Std Avg (s)", "CV Avg (%)"):
+        estimate, low, high = out.loc[metric, ["Estimate", "CI Low", "CI High"]]
+        quarter = (high - low) / 4
+        assert low + quarter < estimate < high - quarter, out
+
+
+@pytest.mark.parametrize("resample", ["runs", "both"])
+def test_run_resampling_gives_no_spread_intervals(config_df, resample):
+    out = bootstrap_single_config(config_df, n_boot=2000, resample=resample, random_seed=1)
+
+    spread = [m for m in out.index if "Std" in m or "CV" in m]
+    assert len(spread) == 7
+    assert out.loc[spread, ["Std Err", "CI Low", "CI High"]].isna().all(axis=None)
+
+    means = out.drop(index=spread)
+    assert (means["CI Low"] <= means["Estimate"]).all(), out
+    assert (means["Estimate"] <= means["CI High"]).all(), out
+
+
+def test_default_cv_interval_covers_known_cv(config_df):
+    out = bootstrap_single_config(config_df, n_boot=2000, random_seed=1)
+
+    # The sample std of 5 runs underestimates sigma by c4(5) ~= 0.94
+    low, high = out.loc["CV Avg (%)", ["CI Low", "CI High"]]
+    assert low < 100 * CV * 0.94 < high
+    assert abs(out.loc["CV Avg (%)", "Bootstrap Bias"]) < out.loc["CV Avg (%)", "Std Err"]
+
+
+def test_run_resampling_bias_is_reported(config_df):
+    out = bootstrap_single_config(config_df, n_boot=2000, resample="both", random_seed=1)
+
+    # Run variance shrinks by (r - 1) / r = 4/5, the std by at least sqrt(4/5)
+    for metric in ("Std Avg (s)", "CV Avg (%)"):
+        estimate, bias = out.loc[metric, ["Estimate", "Bootstrap Bias"]]
+        assert bias < (np.sqrt(4 / 5) - 1) * estimate
@@ -0,0 +1,105 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers import OnlineRepeatabilityStats, summarize_single_config
+
+
+def _rows(run, n_queries=20):
+    rng = np.random.default_rng(run)
+    return [
+        {"query_id": f"q{q}", "Runtime (s)": float(q * (1 + 0.1 * rng.standard_normal()))}
+        for q in range(1, n_queries + 1)
+    ]
+
+
+def _lines(rows):
+    return "".join(json.dumps(row) + "\n" for row in rows)
+
+
+def _expected(logs):
+    df = pd.DataFrame([
+        {"database": f"Run {run}", "query_id": int(row["query_id"][1:]), "Runtime (s)": row["Runtime (s)"]}
+        for run, rows in logs.items()
+        for row in rows
+    ])
+    return summarize_single_config(df)
+
+
+def test_update_log_reads_only_appended_rows(tmp_path):
+    logs = {run: _rows(run) for run in range(1, 6)}
+    paths = {run: tmp_path / f"Workload_log_BASE_{run}.ndjson" for run in logs}
+    stats = OnlineRepeatabilityStats()
+
+    # First poll: run 1 is half written and its last line is torn
+    head = _lines(logs[1][:10])
+    torn = json.dumps(logs[1][10])
+    paths[1].write_text(head + torn[:15])
+    stats.update_log(str(paths[1]))
+    assert stats.runs["Run 1"][0] == 10
+
+    # Second poll: the torn line is completed and the other runs are written
+    with open(paths[1], "a") as f:
+        f.write(torn[15:] + "\n" + _lines(logs[1][11:]))
+    for run in range(2, 6):
+        paths[run].write_text(_lines(logs[run]))
+    for run in range(1, 6):
+        stats.update_log(str(paths[run]))
+    # Nothing new: polling again is a no-op
+    stats.update_log(str(paths[1]))
+
+    assert sum(s[0] for s in stats.runs.values()) == 100
+    pd.testing.assert_frame_equal(stats.summary(), _expected(logs), check_dtype=False, rtol=1e-12)
+
+
+def test_checkpoint_keeps_log_offsets(tmp_path):
+    path = tmp_path / "Workload_log_BASE_1.ndjson"
+    rows = _rows(1)
+    path.write_text(_lines(rows[:12]))
+    stats = OnlineRepeatabilityStats().update_log(str(path))
+
+    restored = OnlineRepeatabilityStats.from_bytes(stats.to_bytes())
+    with open(path, "a") as f:
+        f.write(_lines(rows[12:]))
+    restored.update_log(str(path))
+
+    assert restored.runs["Run 1"][0] == 20
+    assert restored.runs["Run 1"][1] == pytest.approx(np.mean([r["Runtime (s)"] for r in rows]), rel=1e-12)
+
+
+def test_update_log_rejects_rewritten_log(tmp_path):
+    path = tmp_path / "Workload_log_BASE_1.ndjson"
+    path.write_text(_lines(_rows(1)))
+    stats = OnlineRepeatabilityStats().update_log(str(path))
+
+    path.write_text(_lines(_rows(1)[:3]))
+    with pytest.raises(ValueError):
+        stats.update_log(str(path))
+
+
+def test_merge_pools_disjoint_runs(tmp_path):
+    logs = {run: _rows(run) for run in range(1, 6)}
+    collectors = [OnlineRepeatabilityStats(), OnlineRepeatabilityStats()]
+    for run, rows in logs.items():
+        path = tmp_path / f"Workload_log_BASE_{run}.ndjson"
+        path.write_text(_lines(rows))
+        collectors[run % 2].update_log(str(path))
+
+    merged = collectors[0].merge(collectors[1])
+    assert len(merged.offsets) == 5
+    pd.testing.assert_frame_equal(merged.summary(), _expected(logs), check_dtype=False, rtol=1e-12)
+
+
+def test_merge_rejects_shared_runs():
+    # e.g. the same five runs collected for two platforms
+    a = OnlineRepeatabilityStats()
+    b = OnlineRepeatabilityStats()
+    for stats in (a, b):
+        for run in range(1, 6):
+            for row in _rows(run):
+                stats.update(row["query_id"], f"Run {run}", row["Runtime (s)"])
+
+    with pytest.raises(ValueError, match="share runs"):
+        a.merge(b)
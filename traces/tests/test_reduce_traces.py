@@ -0,0 +1,77 @@
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from reduce_traces import reduce_traces
+
+TOOLS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tools")
+
+DOCUMENTS = {
+    "q1.json": {
+        "queryId": "20241109_101500_00001_abcde",
+        "self": "http://coordinator:8080/v1/query/20241109_101500_00001_abcde",
+        "session": {"remoteUserAddress": "10.0.0.7", "user": "trino", "start": "2024-11-09T10:15:00.123Z"},
+        "queryStats": {
+            "createTime": "2024-11-09T10:15:00.123+01:00",
+            "elapsedTime": "1.50s",
+            "executionTime": "1.25s",
+            "analysisTime": "250.00ms",
+            "resourceWaitingTime": "12us",
+            "peakUserMemoryReservation": "1.2MB",
+            "cumulativeUserMemory": 1.5e300,
+            "physicalInputDataSize": 123456789012345678901,
+        },
+        "inputs": [
+            {
+                "connectorInfo": {"tableLocation": "s3://warehouse/tpcds/store_sales"},
+                "splitInfo": {"path": "s3://warehouse/tpcds/store_sales/data/00000.parquet", "start": 0},
+                "ratio": 0.1,
+                "small": 1e-05,
+            },
+        ],
+        "query": "SELECT 'tab\there', 'é', '\u007f'",
+    },
+    "q2.json": {
+        "queryStats": {"elapsedTime": "3.2m", "executionTime": 4.5, "analysisTime": "1h", "resourceWaitingTime": "n/a"},
+        "stages": [[], {}, [{"splitInfo": {"length": 10}}], -0.0, 2.5e-07],
+    },
+    "q10.json": {"state": "FAILED"},
+}
+
+
+def _write_tree(root):
+    lakehouse = root / "TPCDS" / "lakehouse_abc_1"
+    lakehouse.mkdir(parents=True)
+    for name, doc in DOCUMENTS.items():
+        (lakehouse / name).write_text(json.dumps(doc, ensure_ascii=False))
+    # jq writes nothing for an empty input
+    (lakehouse / "q3.json").write_text("")
+
+
+def _read_tree(root):
+    return {
+        os.path.relpath(os.path.join(d, f), root): open(os.path.join(d, f), "rb").read()
+        for d, _, files in os.walk(root)
+        for f in files
+    }
+
+
+@pytest.mark.skipif(shutil.which("jq") is None or shutil.which("bash") is None, reason="jq not installed")
+def test_reduce_traces_matches_jq_scripts(tmp_path):
+    jq_root, py_root = tmp_path / "jq", tmp_path / "py"
+    _write_tree(jq_root)
+    _write_tree(py_root)
+
+    for cmd in (
+        ["bash", os.path.join(TOOLS, "scrub_lakehouse_traces.sh"), str(jq_root), "0", os.path.join(TOOLS, "scrub.jq")],
+        ["bash", os.path.join(TOOLS, "make_lakehouse_workload_logs.sh"), str(jq_root), "0"],
+    ):
+        subprocess.run(cmd, check=True, capture_output=True)
+    reduce_traces(str(py_root), workers=1)
+
+    jq_files, py_files = _read_tree(jq_root), _read_tree(py_root)
+    assert "TPCDS/Workload_log_abc_1.ndjson" in jq_files
+    assert py_files == jq_files
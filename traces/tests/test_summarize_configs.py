@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers import summarize_configs, summarize_single_config
+
+REPEATABILITY_COLS = ["Std Avg (s)", "Std P50 (s)", "Std P99 (s)", "CV Avg (%)", "CV P50 (%)", "CV P99 (%)"]
+
+
+def _config(name, n_queries, seed):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame([
+        {"config": name, "database": f"Run {run}", "query_id": q,
+         "Runtime (s)": q * (1 + 0.1 * rng.standard_normal())}
+        for run in range(1, 6)
+        for q in range(1, n_queries + 1)
+    ])
+
+
+@pytest.fixture
+def long_df():
+    full = _config("AWS/SF_10", 12, 0)
+
+    # Missing and failed runs, and rows without a query id (they count for
+    # the run means only)
+    ragged = _config("GCP/SF_10", 12, 1)
+    ragged = ragged.drop(ragged.index[(ragged["query_id"] == 3) & (ragged["database"] == "Run 2")])
+    ragged = ragged.drop(ragged.index[(ragged["query_id"] == 7) & (ragged["database"] != "Run 1")])
+    ragged.loc[ragged["query_id"] == 5, "Runtime (s)"] = np.where(
+        ragged.loc[ragged["query_id"] == 5, "database"] == "Run 4", np.nan, 5.0
+    )
+    ragged.loc[ragged["query_id"] == 9, "query_id"] = np.nan
+
+    # A config where no query has all five runs
+    partial = _config("Azure/SF_10", 4, 2)
+    partial = partial[partial["database"] != "Run 5"]
+
+    # A config without any runtime
+    failed = _config("Self_Hosted/SF_10", 3, 3).assign(**{"Runtime (s)": np.nan})
+
+    return pd.concat([full, ragged, partial, failed], ignore_index=True).sample(frac=1, random_state=0)
+
+
+def test_summarize_configs_matches_single(long_df):
+    got = summarize_configs(long_df).set_index("config")
+    assert list(got.index) == sorted(long_df["config"].unique())
+
+    for config in ("AWS/SF_10", "GCP/SF_10"):
+        expected = summarize_single_config(long_df[long_df["config"] == config])
+        row = got.loc[config, expected.columns]
+        np.testing.assert_allclose(row.to_numpy(dtype=float), expected.iloc[0].to_numpy(dtype=float), rtol=1e-12)
+    # Queries 3, 5 and 7 lost runs, query 9 its id
+    assert got.loc["GCP/SF_10", "Queries"] == 8
+
+
+def test_summarize_configs_without_full_queries(long_df):
+    got = summarize_configs(long_df).set_index("config")
+
+    # summarize_single_config() cannot compute repeatability here; the
+    # across-workload columns still match it
+    partial = long_df[long_df["config"] == "Azure/SF_10"]
+    with pytest.raises(IndexError):
+        summarize_single_config(partial)
+    across = ["Mean Runtime Avg (s)", "Mean Runtime Std (s)", "Mean Runtime P50 (s)", "Mean Runtime P99 (s)"]
+    run_means = partial.groupby("database")["Runtime (s)"].mean().to_numpy()
+    np.testing.assert_allclose(
+        got.loc["Azure/SF_10", across].to_numpy(dtype=float),
+        [run_means.mean(), run_means.std(ddof=1), np.percentile(run_means, 50), np.percentile(run_means, 99)],
+        rtol=1e-12,
+    )
+    assert got.loc["Azure/SF_10", REPEATABILITY_COLS].isna().all()
+    assert got.loc["Azure/SF_10", "Runs"] == 4 and got.loc["Azure/SF_10", "Queries"] == 0
+
+    # No runtime at all: every column NaN, as summarize_single_config()
+    expected = summarize_single_config(long_df[long_df["config"] == "Self_Hosted/SF_10"])
+    assert expected.isna().all(axis=None)
+    assert got.loc["Self_Hosted/SF_10", expected.columns].isna().all()
@@ -0,0 +1,64 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers import compact_trace_logs, load_trino_times, load_trino_times_from_store
+
+
+def _log(run, n_queries=6):
+    rng = np.random.default_rng(run)
+    rows = [
+        {
+            "query_id": f"q{q}",
+            "Runtime (s)": float(q * (1 + 0.1 * rng.standard_normal())),
+            "elapsed_s": float(q),
+            "execution_s": float(q) * 0.8,
+            "planning_s": 0.25,
+            "resource_waiting_s": 1.2e-05,
+        }
+        for q in range(n_queries, 0, -1)
+    ]
+    # A failed query and a row without a usable query id
+    rows[1].update({"Runtime (s)": -1, "elapsed_s": -1})
+    rows.append({"query_id": "warmup", "Runtime (s)": 0.5, "elapsed_s": 0.5,
+                 "execution_s": 0.4, "planning_s": 0.1, "resource_waiting_s": 0})
+    return "".join(json.dumps(row) + "\n" for row in rows)
+
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+@pytest.fixture
+def traces_dir(tmp_path):
+    # AWS/SF_10 is in both studies, with run numbers that do not overlap
+    for study, platform, runs in (("study_1", "AWS", (1, 2)), ("study_2", "AWS", (3,)), ("study_2", "GCP", (1,))):
+        for run in runs:
+            _write(tmp_path / study / platform / "SF_10" / f"Workload_log_BASE_{run}.ndjson", _log(run))
+        # Other lakehouse tokens are stored but not read as BASE
+        _write(tmp_path / study / platform / "SF_10" / "Workload_log_CACHE_1.ndjson", _log(99))
+    return tmp_path
+
+
+def test_store_matches_ndjson_loader(traces_dir, tmp_path):
+    store = compact_trace_logs(str(traces_dir), store_dir=str(tmp_path / "store"))
+
+    for study, platform in (("study_1", "AWS"), ("study_2", "AWS"), ("study_2", "GCP")):
+        expected = load_trino_times(str(traces_dir / study / platform / "SF_10"))
+        got = load_trino_times_from_store(store, platform, "SF_10", study=study)
+        pd.testing.assert_frame_equal(got, expected)
+
+    # study=None reads the config from every study, as one directory holding all its logs
+    for run in (1, 2, 3):
+        study = "study_1" if run < 3 else "study_2"
+        src = traces_dir / study / "AWS" / "SF_10" / f"Workload_log_BASE_{run}.ndjson"
+        _write(tmp_path / "merged" / src.name, src.read_text())
+    expected = load_trino_times(str(tmp_path / "merged"))
+    got = load_trino_times_from_store(store, "AWS", "SF_10")
+    pd.testing.assert_frame_equal(got, expected)
+
+    got = load_trino_times_from_store(store, "AWS", "SF_10", study="study_1", columns=["Runtime (s)"])
+    pd.testing.assert_frame_equal(got, expected.loc[expected["database"] != "Run 3", list(got.columns)].reset_index(drop=True))
@@ -1,5 +1,5 @@
 import pandas as pd
-import os, re, json
+import os, re, json, warnings
 import numpy as np
 import math
 
@@ -90,6 +90,260 @@ def summarize_single_config(
     return pd.DataFrame([row])
 
 
+_SUMMARY_COLS = [
+    "Mean Runtime Avg (s)", "Mean Runtime Std (s)",
+    "Mean Runtime P50 (s)", "Mean Runtime P99 (s)",
+    "Std Avg (s)", "Std P50 (s)", "Std P99 (s)",
+    "CV Avg (%)", "CV P50 (%)", "CV P99 (%)",
+    "Runs", "Queries",
+]
+
+
+def _grouped_stats(values: np.ndarray, lengths: np.ndarray, *, std: bool = False) -> dict:
+    """
+    mean / (Bessel) std / P50 / P99 of groups stored back to back in `values`.
+
+    Groups of equal length are stacked into one 2-D block and reduced along
+    axis 1, which gives bitwise the same numbers as np.mean / np.std /
+    np.percentile on each group (ragged reductions such as np.add.reduceat
+    sum in a different order). Empty groups give NaN.
+    """
+    n = len(lengths)
+    out = {k: np.full(n, np.nan) for k in ("mean", "std", "p50", "p99")}
+    starts = np.cumsum(lengths) - lengths
+
+    for length in np.unique(lengths[lengths > 0]):
+        groups = np.flatnonzero(lengths == length)
+        block = values[starts[groups, None] + np.arange(length)]
+
+        out["mean"][groups] = block.mean(axis=1)
+        if std and length > 1:
+            out["std"][groups] = block.std(axis=1, ddof=1)
+        out["p50"][groups], out["p99"][groups] = np.percentile(block, [50, 99], axis=1)
+
+    return out
+
+
+def summarize_configs(
+    df: pd.DataFrame,
+    *,
+    config_col: str = "config",
+    runtime_col: str = "Runtime (s)",
+    run_col: str = "database",
+    query_col: str = "query_id",
+    runs_per_query: int = 5,
+) -> pd.DataFrame:
+    """
+    summarize_single_config() for every configuration of a long DataFrame
+    at once: one row per `config_col` value (sorted), with the same metric
+    columns and identical numbers.
+
+    Per-run means, per-query means, Bessel std and CV and the percentile
+    aggregates are computed with grouped, vectorised operations over all
+    configurations together. Queries count towards the std/CV statistics
+    only with exactly `runs_per_query` runtimes, as in the single version.
+
+    Where summarize_single_config() would fail (no query with a full set of
+    runs) the repeatability columns are NaN and Queries is 0; configurations
+    without any runtime get an all-NaN row.
+    """
+    sub = df.loc[df[runtime_col].notna() & df[config_col].notna(), [config_col, run_col, query_col, runtime_col]]
+    configs = pd.Index(df[config_col].dropna().unique()).sort_values()
+
+    # --- Across Workloads: per (config, run) means, runs in sorted order per config
+    run_means = sub.groupby([config_col, run_col], sort=True)[runtime_col].mean()
+    run_counts = run_means.groupby(level=0, sort=True).size().reindex(configs, fill_value=0)
+    across = _grouped_stats(run_means.to_numpy(dtype=float), run_counts.to_numpy(), std=True)
+
+    # --- Across Queries: Bessel std over full groups of runs_per_query runtimes
+    sub = sub[sub[query_col].notna()].sort_values([config_col, query_col], kind="stable")
+    q = sub.groupby([config_col, query_col], sort=True)[runtime_col]
+    q_mean = q.mean()
+    q_size = q.size().to_numpy()
+
+    # Rows of sub are already in (config, query) group order, original order within groups
+    group_of_row = np.repeat(np.arange(len(q_size)), q_size)
+    # A single runtime has no Bessel std; summarize_single_config() drops those queries
+    full = (q_size == runs_per_query) & (runs_per_query > 1)
+    runtimes = sub[runtime_col].to_numpy(dtype=float)[full[group_of_row]].reshape(-1, runs_per_query)
+    q_std = runtimes.std(axis=1, ddof=1)
+    q_cv = 100.0 * q_std / q_mean.to_numpy(dtype=float)[full]
+
+    q_counts = pd.Series(q_mean.index.get_level_values(0)[full]).value_counts().reindex(configs, fill_value=0)
+    std_stats = _grouped_stats(q_std, q_counts.to_numpy())
+    cv_stats = _grouped_stats(q_cv, q_counts.to_numpy())
+
+    out = pd.DataFrame({
+        config_col: configs,
+        "Mean Runtime Avg (s)": across["mean"],
+        "Mean Runtime Std (s)": across["std"],
+        "Mean Runtime P50 (s)": across["p50"],
+        "Mean Runtime P99 (s)": across["p99"],
+
+        "Std Avg (s)": std_stats["mean"],
+        "Std P50 (s)": std_stats["p50"],
+        "Std P99 (s)": std_stats["p99"],
+
+        "CV Avg (%)": cv_stats["mean"],
+        "CV P50 (%)": cv_stats["p50"],
+        "CV P99 (%)": cv_stats["p99"],
+
+        "Runs": run_counts.to_numpy(),
+        "Queries": q_counts.to_numpy(),
+    })
+
+    # As summarize_single_config(): no runtime at all -> every column NaN
+    empty = run_counts.to_numpy() == 0
+    if empty.any():
+        out[["Runs", "Queries"]] = out[["Runs", "Queries"]].astype(float)
+        out.loc[empty, _SUMMARY_COLS] = np.nan
+
+    return out
+
+
+def _nan_row_stats(a: np.ndarray):
+    """
+    mean, Bessel std, P50 and P99 (linear, as np.percentile) of each row of
+    `a`, ignoring NaNs; rows without values give NaN.
+    """
+    with np.errstate(invalid="ignore", divide="ignore"):
+        k = (~np.isnan(a)).sum(axis=1)
+        mean = np.nansum(a, axis=1) / k
+        std = np.sqrt(np.nansum(np.square(a - mean[:, None]), axis=1) / (k - 1))
+        std[k < 2] = np.nan
+
+        s = np.sort(a, axis=1)  # NaNs last
+        rows = np.arange(len(a))
+        pct = []
+        for q in (0.50, 0.99):
+            idx = np.maximum(k - 1, 0) * q
+            lo = np.floor(idx).astype(np.int64)
+            hi = np.minimum(lo + 1, np.maximum(k - 1, 0))
+            g = idx - lo
+            below, above = s[rows, lo], s[rows, hi]
+            v = np.where(g >= 0.5, above - (above - below) * (1 - g), below + (above - below) * g)
+            v[k == 0] = np.nan
+            pct.append(v)
+
+    return mean, std, pct[0], pct[1]
+
+
+def _bootstrap_chunk(matrix, n, seed, resample_queries, resample_runs, runs_per_query):
+    """
+    n bootstrap replicates of the summarize_single_config() metrics from a
+    (query x run) runtime matrix (NaN = missing), as an (n, 10) array.
+    """
+    rng = np.random.default_rng(seed)
+    n_queries, n_runs = matrix.shape
+
+    qi = rng.integers(0, n_queries, size=(n, n_queries)) if resample_queries else np.broadcast_to(np.arange(n_queries), (n, n_queries))
+    ri = rng.integers(0, n_runs, size=(n, n_runs)) if resample_runs else np.broadcast_to(np.arange(n_runs), (n, n_runs))
+    x = matrix[qi[:, :, None], ri[:, None, :]]  # (n, queries, runs)
+
+    # Across workloads: mean runtime of each (resampled) run
+    with np.errstate(invalid="ignore", divide="ignore"):
+        run_means = np.nansum(x, axis=1) / (~np.isnan(x)).sum(axis=1)
+    run_avg, run_std, run_p50, run_p99 = _nan_row_stats(run_means)
+
+    # Across queries: std/CV of queries with a runtime in every run (NaN otherwise)
+    if n_runs == runs_per_query and n_runs > 1:
+        q_std = x.std(axis=2, ddof=1)
+        q_cv = 100.0 * q_std / x.mean(axis=2)
+    else:
+        q_std = q_cv = np.full((n, n_queries), np.nan)
+    std_avg, _, std_p50, std_p99 = _nan_row_stats(q_std)
+    cv_avg, _, cv_p50, cv_p99 = _nan_row_stats(q_cv)
+
+    return np.column_stack([
+        run_avg, run_std, run_p50, run_p99,
+        std_avg, std_p50, std_p99,
+        cv_avg, cv_p50, cv_p99,
+    ])
+
+
+def bootstrap_single_config(
+    df: pd.DataFrame,
+    *,
+    runtime_col: str = "Runtime (s)",
+    run_col: str = "database",
+    query_col: str = "query_id",
+    n_boot: int = 10_000,
+    confidence: float = 0.95,
+    resample: str = "queries",
+    random_seed: int = 0,
+    workers: int = 1,
+    chunk_size: int = 1000,
+    runs_per_query: int = 5,
+) -> pd.DataFrame:
+    """
+    Bootstrap confidence intervals for the metrics of summarize_single_config().
+
+    Runtimes are pivoted into a (query x run) matrix once; each replicate
+    draws queries and/or runs with replacement (`resample` = "queries",
+    "runs" or "both") as NumPy index matrices and recomputes every metric
+    on the gathered (replicates, queries, runs) block, so no pandas work is
+    done per replicate. "queries" (the default) keeps each query's runs
+    intact and only reflects the choice of queries. Resampling runs repeats
+    runs within a replicate, which biases the per-query variance low by
+    (r - 1) / r for r runs, and the std and CV by more; with "runs" or
+    "both" the Std and CV metrics (Mean Runtime Std included) therefore get
+    no Std Err or interval (NaN), only their Bootstrap Bias.
+
+    Intervals are plain percentile intervals of the replicates. Bootstrap
+    Bias is mean(replicates) - Estimate; it is reported, not applied.
+
+    Replicates are generated in chunks of `chunk_size` with independent
+    seeds spawned from `random_seed`, so the result does not depend on
+    `workers`; with workers > 1 the chunks run in a process pool.
+
+    Returns one row per metric: Estimate (summarize_single_config()),
+    Std Err, Bootstrap Bias, and the percentile CI Low / CI High at
+    `confidence`.
+    """
+    if resample not in ("both", "queries", "runs"):
+        raise ValueError("resample must be 'both', 'queries' or 'runs'")
+
+    estimate = summarize_single_config(df, runtime_col=runtime_col, run_col=run_col, query_col=query_col).iloc[0]
+    metrics = _SUMMARY_COLS[:10]
+
+    sub = df[pd.notna(df[runtime_col])]
+    matrix = sub.pivot_table(index=query_col, columns=run_col, values=runtime_col, aggfunc="mean").to_numpy(dtype=float)
+
+    sizes = [min(chunk_size, n_boot - i) for i in range(0, n_boot, chunk_size)]
+    seeds = np.random.SeedSequence(random_seed).spawn(len(sizes))
+    args = (sizes, seeds, [resample != "runs"] * len(sizes), [resample != "queries"] * len(sizes), [runs_per_query] * len(sizes))
+
+    if workers > 1 and len(sizes) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(_bootstrap_chunk, [matrix] * len(sizes), *args))
+    else:
+        chunks = list(map(_bootstrap_chunk, [matrix] * len(sizes), *args))
+
+    reps = np.concatenate(chunks) if chunks else np.empty((0, len(metrics)))
+    alpha = 100.0 * (1.0 - confidence) / 2.0
+    with warnings.catch_warnings():
+        # All-NaN metrics (e.g. no complete queries) give NaN intervals
+        warnings.simplefilter("ignore", RuntimeWarning)
+        ci_low, ci_high = np.nanpercentile(reps, [alpha, 100.0 - alpha], axis=0)
+        std_err = np.nanstd(reps, axis=0, ddof=1)
+        point = np.array([estimate[m] for m in metrics], dtype=float)
+        bias = np.nanmean(reps, axis=0) - point
+
+    if resample != "queries":
+        # Repeated runs shrink every std over runs; no interval for Std / CV
+        spread = np.array(["Std" in m or "CV" in m for m in metrics])
+        std_err[spread] = ci_low[spread] = ci_high[spread] = np.nan
+
+    return pd.DataFrame({
+        "Estimate": point,
+        "Std Err": std_err,
+        "Bootstrap Bias": bias,
+        "CI Low": ci_low,
+        "CI High": ci_high,
+    }, index=pd.Index(metrics, name="Metric"))
+
+
 _RUNLOG_RE = re.compile(r"^Workload_log_BASE_(?P<run>\d+)\.ndjson$", re.IGNORECASE)
 _QID_RE = re.compile(r"^q(?P<num>\d+)$", re.IGNORECASE)
 
@@ -168,6 +422,357 @@ def load_trino_times(
 
     return out.reset_index(drop=True)
 
+
+_ANY_RUNLOG_RE = re.compile(r"^Workload_log_(?P<lakehouse>[^_]+)_(?P<run>\d+)\.ndjson$", re.IGNORECASE)
+
+_STORE_PARTITIONS = ["study", "platform", "config", "lakehouse", "run"]
+_STORE_VALUE_COLS = ["query_id", "Runtime (s)", "elapsed_s", "execution_s", "planning_s", "resource_waiting_s"]
+
+
+def compact_trace_logs(
+    traces_dir: str = ".",
+    store_dir: str | None = None,
+    *,
+    studies=("study_1", "study_2"),
+) -> str:
+    """
+    One-time compaction of every Workload_log_<LAKEHOUSE>_<run>.ndjson under
+    <traces_dir>/<study>/<platform>/<config>/ into a Hive-partitioned Parquet
+    dataset (study / platform / config / lakehouse / run), where config is
+    the SF_X or lakehouse-type directory and lakehouse the file's token
+    (BASE, CACHE, LOAD, ...).
+
+    query_id is stored as an integer and negative times as null, so
+    load_trino_times_from_store() needs no per-row work. Re-running
+    replaces the partitions it writes. Returns the store directory.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    store_dir = store_dir or os.path.join(traces_dir, "trace_store")
+
+    frames = []
+    for study in studies:
+        study_dir = os.path.join(traces_dir, study)
+        if not os.path.isdir(study_dir):
+            continue
+        for platform in sorted(os.listdir(study_dir)):
+            platform_dir = os.path.join(study_dir, platform)
+            if not os.path.isdir(platform_dir):
+                continue
+            for config in sorted(os.listdir(platform_dir)):
+                config_dir = os.path.join(platform_dir, config)
+                if not os.path.isdir(config_dir):
+                    continue
+                for fname in sorted(os.listdir(config_dir)):
+                    m = _ANY_RUNLOG_RE.match(fname)
+                    if not m:
+                        continue
+
+                    # Parsed as load_trino_times() does, so values round-trip exactly
+                    df = pd.read_json(os.path.join(config_dir, fname), lines=True)
+                    df = df.reindex(columns=_STORE_VALUE_COLS)
+
+                    qid = df["query_id"].astype("string").str.strip().str.extract(_QID_RE.pattern, flags=re.IGNORECASE)["num"]
+                    df["query_id"] = pd.to_numeric(qid, errors="coerce").astype("Int64")
+                    for col in _STORE_VALUE_COLS[1:]:
+                        df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+                        df.loc[df[col] < 0, col] = np.nan
+
+                    df["study"] = study
+                    df["platform"] = platform
+                    df["config"] = config
+                    df["lakehouse"] = m.group("lakehouse").upper()
+                    df["run"] = int(m.group("run"))
+                    frames.append(df)
+
+    if not frames:
+        raise FileNotFoundError(f"No Workload_log_*.ndjson files under {traces_dir}")
+
+    schema = pa.schema(
+        [("query_id", pa.int64())]
+        + [(c, pa.float64()) for c in _STORE_VALUE_COLS[1:]]
+        + [(c, pa.string()) for c in _STORE_PARTITIONS[:-1]]
+        + [("run", pa.int32())]
+    )
+    table = pa.Table.from_pandas(pd.concat(frames, ignore_index=True), schema=schema, preserve_index=False)
+
+    ds.write_dataset(
+        table,
+        store_dir,
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema([schema.field(c) for c in _STORE_PARTITIONS]), flavor="hive"),
+        basename_template="part-{i}.parquet",
+        existing_data_behavior="delete_matching",
+    )
+    return store_dir
+
+
+def load_trino_times_from_store(
+    store_dir: str,
+    platform: str,
+    config: str,
+    *,
+    study: str | None = None,
+    lakehouse: str = "BASE",
+    columns=None,
+) -> pd.DataFrame:
+    """
+    load_trino_times() for <platform>/<config> from a compact_trace_logs()
+    store. Only the matching partitions and the requested value columns
+    (default: all) are read; the result has the same columns, order and
+    "Run <n>" labels as load_trino_times() on the ndjson directory.
+
+    `lakehouse` selects the Workload_log token; BASE is what
+    load_trino_times() reads.
+    """
+    import pyarrow.dataset as ds
+
+    value_cols = list(_STORE_VALUE_COLS if columns is None else dict.fromkeys(["query_id", *columns]))
+
+    dataset = ds.dataset(store_dir, format="parquet", partitioning="hive")
+    predicate = (
+        (ds.field("platform") == platform)
+        & (ds.field("config") == config)
+        & (ds.field("lakehouse") == lakehouse.upper())
+    )
+    if study is not None:
+        predicate &= ds.field("study") == study
+
+    df = dataset.to_table(columns=value_cols + ["run"], filter=predicate).to_pandas()
+    if df.empty:
+        return pd.DataFrame(columns=["database", *value_cols])
+
+    # As load_trino_times(): files in run order, then a stable (database, query_id) sort
+    df = df.sort_values("run", kind="stable")
+    df["database"] = "Run " + df.pop("run").astype(str)
+    if df["query_id"].notna().all():
+        df["query_id"] = df["query_id"].astype("int64")
+    else:
+        df["query_id"] = df["query_id"].astype("float64")
+
+    out = df.sort_values(["database", "query_id"], kind="stable")
+    return out.reset_index(drop=True)
+
+
+def _welford_merge(a, b):
+    # Chan et al. combination of two (count, mean, M2) states
+    n = a[0] + b[0]
+    if n == 0:
+        return [0, 0.0, 0.0]
+    delta = b[1] - a[1]
+    return [n, a[1] + delta * b[0] / n, a[2] + b[2] + delta * delta * a[0] * b[0] / n]
+
+
+class OnlineRepeatabilityStats:
+    """
+    Incremental version of summarize_single_config() for campaigns that are
+    still running: Workload_log rows are folded in as they arrive and the
+    same metrics are available at any time via summary().
+
+    State is one Welford (count, mean, M2) per query and per run label. The
+    summary's percentiles are taken over one value per query or per run, so
+    they are computed exactly from that state on demand; no raw runtimes
+    are kept.
+
+    States of one configuration merge when they hold disjoint runs (e.g.
+    collectors tailing different run logs), and to_bytes() / from_bytes()
+    give a compact checkpoint, including how far each log has been read by
+    update_log().
+    """
+
+    _FORMAT_VERSION = 1
+
+    def __init__(self, runs_per_query: int = 5, runtime_col: str = "Runtime (s)"):
+        self.runs_per_query = runs_per_query
+        self.runtime_col = runtime_col
+        self.queries = {}   # query id -> [count, mean, M2]
+        self.runs = {}      # run label -> [count, mean, M2]
+        self.offsets = {}   # absolute log path -> bytes consumed by update_log()
+
+    @staticmethod
+    def _add(state: dict, key, x: float) -> None:
+        s = state.get(key)
+        if s is None:
+            s = state[key] = [0, 0.0, 0.0]
+        s[0] += 1
+        delta = x - s[1]
+        s[1] += delta / s[0]
+        s[2] += delta * (x - s[1])
+
+    @staticmethod
+    def _query_key(qid):
+        # As load_trino_times(): "q64" -> 64; unparseable ids count for runs only
+        if qid is None or (isinstance(qid, float) and math.isnan(qid)):
+            return None
+        if isinstance(qid, (int, np.integer)):
+            return int(qid)
+        if isinstance(qid, (float, np.floating)):
+            return int(qid) if float(qid).is_integer() else None
+        m = _QID_RE.match(str(qid).strip())
+        return int(m.group("num")) if m else None
+
+    def update(self, query_id, run: str, runtime) -> None:
+        """
+        Add one runtime; missing or negative runtimes are ignored, as in
+        load_trino_times().
+        """
+        try:
+            x = float(runtime)
+        except (TypeError, ValueError):
+            return
+        if math.isnan(x) or x < 0:
+            return
+
+        self._add(self.runs, run, x)
+        key = self._query_key(query_id)
+        if key is not None:
+            self._add(self.queries, key, x)
+
+    def update_frame(
+        self,
+        df: pd.DataFrame,
+        *,
+        run_col: str = "database",
+        query_col: str = "query_id",
+    ) -> "OnlineRepeatabilityStats":
+        """ Add the rows of a load_trino_times()-shaped DataFrame. """
+        for qid, run, x in zip(df[query_col].to_numpy(), df[run_col].to_numpy(), df[self.runtime_col].to_numpy()):
+            self.update(qid, run, x)
+        return self
+
+    def update_log(self, path: str, run: str | None = None) -> "OnlineRepeatabilityStats":
+        """
+        Add the rows appended to a Workload_log_<LAKEHOUSE>_<run>.ndjson file
+        since the last call for that path; the run label defaults to
+        "Run <run>" from the name.
+
+        Only newline-terminated lines are consumed, so a line still being
+        written is held back for the next call; unparseable lines are
+        skipped. Logs are expected to only grow.
+        """
+        if run is None:
+            m = _ANY_RUNLOG_RE.match(os.path.basename(path))
+            if not m:
+                raise ValueError(f"Cannot infer the run from {path}; pass run=")
+            run = f"Run {int(m.group('run'))}"
+
+        key = os.path.abspath(path)
+        offset = self.offsets.get(key, 0)
+        with open(path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size < offset:
+                raise ValueError(f"{path} is shorter than the {offset} bytes already read")
+            f.seek(offset)
+            data = f.read(size - offset)
+
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue
+            self.update(row.get("query_id"), run, row.get(self.runtime_col))
+        self.offsets[key] = offset + end
+        return self
+
+    def merge(self, other: "OnlineRepeatabilityStats") -> "OnlineRepeatabilityStats":
+        """
+        Fold in another state of the same configuration holding other runs;
+        each query's runtimes then pool across both. States of different
+        configurations (e.g. per platform) must not be merged, as their
+        queries would pool into one set; shared run labels are rejected.
+        """
+        if other.runs_per_query != self.runs_per_query:
+            raise ValueError("Cannot merge states with different runs_per_query")
+        shared = sorted(set(self.runs) & set(other.runs))
+        if shared:
+            raise ValueError(f"Cannot merge states that share runs: {', '.join(map(str, shared))}")
+
+        for key, s in other.queries.items():
+            self.queries[key] = _welford_merge(self.queries[key], s) if key in self.queries else list(s)
+        self.runs.update((key, list(s)) for key, s in other.runs.items())
+        self.offsets.update(other.offsets)
+        return self
+
+    def summary(self) -> pd.DataFrame:
+        """ The single-row DataFrame summarize_single_config() returns for the rows seen so far. """
+        if not self.runs:
+            return pd.DataFrame([{col: np.nan for col in _SUMMARY_COLS}])
+
+        # Sorted like the groupby in summarize_single_config()
+        run_means = np.array([self.runs[r][1] for r in sorted(self.runs)])
+        full = np.array([s for _, s in sorted(self.queries.items()) if s[0] == self.runs_per_query and s[0] > 1]).reshape(-1, 3)
+        std_values = np.sqrt(full[:, 2] / (full[:, 0] - 1))
+        cv_values = 100.0 * std_values / full[:, 1]
+
+        def _agg(values):
+            if len(values) == 0:
+                return np.nan, np.nan, np.nan
+            return np.mean(values), np.percentile(values, 50), np.percentile(values, 99)
+
+        avg_std_s, p50_std_s, p99_std_s = _agg(std_values)
+        avg_cv_pct, p50_cv_pct, p99_cv_pct = _agg(cv_values)
+
+        row = {
+            "Mean Runtime Avg (s)": np.mean(run_means),
+            "Mean Runtime Std (s)": np.std(run_means, ddof=1) if len(run_means) > 1 else np.nan,
+            "Mean Runtime P50 (s)": np.percentile(run_means, 50),
+            "Mean Runtime P99 (s)": np.percentile(run_means, 99),
+
+            "Std Avg (s)": avg_std_s,
+            "Std P50 (s)": p50_std_s,
+            "Std P99 (s)": p99_std_s,
+
+            "CV Avg (%)": avg_cv_pct,
+            "CV P50 (%)": p50_cv_pct,
+            "CV P99 (%)": p99_cv_pct,
+
+            "Runs": len(run_means),
+            "Queries": len(full),
+        }
+        return pd.DataFrame([row])
+
+    def to_bytes(self) -> bytes:
+        """
+        Compact checkpoint: a small JSON header with the keys, then the
+        (count, mean, M2) triples as float64, zlib-compressed.
+        """
+        import struct, zlib
+
+        header = json.dumps({
+            "v": self._FORMAT_VERSION,
+            "runs_per_query": self.runs_per_query,
+            "runtime_col": self.runtime_col,
+            "queries": list(self.queries),
+            "runs": list(self.runs),
+            "offsets": self.offsets,
+        }, separators=(",", ":")).encode("utf-8")
+        values = np.array([*self.queries.values(), *self.runs.values()], dtype="<f8").reshape(-1, 3)
+        return zlib.compress(struct.pack("<I", len(header)) + header + values.tobytes())
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "OnlineRepeatabilityStats":
+        import struct, zlib
+
+        raw = zlib.decompress(data)
+        (header_len,) = struct.unpack_from("<I", raw)
+        header = json.loads(raw[4:4 + header_len])
+        if header.get("v") != cls._FORMAT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version: {header.get('v')}")
+
+        values = np.frombuffer(raw[4 + header_len:], dtype="<f8").reshape(-1, 3)
+        stats = cls(runs_per_query=header["runs_per_query"], runtime_col=header["runtime_col"])
+        keys = header["queries"] + header["runs"]
+        states = [[int(n), float(mean), float(m2)] for n, mean, m2 in values]
+        stats.queries = dict(zip(header["queries"], states[:len(header["queries"])]))
+        stats.runs = dict(zip(header["runs"], states[len(header["queries"]):len(keys)]))
+        stats.offsets = dict(header["offsets"])
+        return stats
+
+
 def table_1_latex_row_from_table(
     table: pd.DataFrame,
     platform: str,
@@ -0,0 +1,431 @@
+"""
+Scrub and summarise Trino query-info traces in one pass per file.
+
+Python equivalent of scrub_lakehouse_traces.sh (scrub.jq) and
+make_lakehouse_workload_logs.sh. Scrubbed JSON and Workload_log_*.ndjson
+output are byte-for-byte what jq 1.6 writes, but each file is parsed once
+and files are spread over a process pool instead of spawning jq per file.
+
+Usage:
+  python3 tools/reduce_traces.py <cluster_or_type_dir> [dry_run 0|1] [--scrub] [--summary] [--workers N]
+"""
+import argparse
+import fnmatch
+import json
+import math
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json is the fallback
+    orjson = None
+
+
+_DBL_MAX = sys.float_info.max
+
+_JQ_ESCAPES = {'"': '\\"', "\\": "\\\\", "\n": "\\n", "\t": "\\t", "\r": "\\r", "\b": "\\b", "\f": "\\f"}
+_JQ_ESCAPE_RE = re.compile(r'["\\\x00-\x1f\x7f]')
+
+
+def jq_number(x) -> str:
+    """
+    A number as jq 1.6 prints it: the shortest round-trip digits (as repr),
+    exponent form when decpt <= -4 or decpt > ndigits + 15, at least two
+    exponent digits, infinities clamped to +/-DBL_MAX, NaN as null.
+    """
+    x = float(x)
+    if x != x:
+        return "null"
+    x = max(-_DBL_MAX, min(_DBL_MAX, x))
+    if x == 0:
+        return "-0" if math.copysign(1.0, x) < 0 else "0"
+
+    mantissa, _, exp = repr(abs(x)).partition("e")
+    int_part, _, frac = mantissa.partition(".")
+    combined = int_part + frac
+    stripped = combined.lstrip("0")
+    digits = stripped.rstrip("0")
+    decpt = len(int_part) - (len(combined) - len(stripped)) + (int(exp) if exp else 0)
+    n = len(digits)
+
+    if decpt <= -4 or decpt > n + 15:
+        e = decpt - 1
+        s = digits[0] + ("." + digits[1:] if n > 1 else "") + "e" + ("-" if e < 0 else "+") + f"{abs(e):02d}"
+    elif decpt <= 0:
+        s = "0." + "0" * (-decpt) + digits
+    elif decpt >= n:
+        s = digits + "0" * (decpt - n)
+    else:
+        s = digits[:decpt] + "." + digits[decpt:]
+
+    return "-" + s if x < 0 else s
+
+
+def jq_string(s: str) -> str:
+    """ A string as jq prints it: only quotes, backslashes and control characters (incl. DEL) escaped. """
+    return '"' + _JQ_ESCAPE_RE.sub(lambda m: _JQ_ESCAPES.get(m.group(), f"\\u{ord(m.group()):04x}"), s) + '"'
+
+
+def _dump(node, out: List[str], indent: Optional[int], level: int) -> None:
+    if node is None:
+        out.append("null")
+    elif node is True:
+        out.append("true")
+    elif node is False:
+        out.append("false")
+    elif isinstance(node, str):
+        out.append(jq_string(node))
+    elif isinstance(node, (int, float)):
+        out.append(jq_number(node))
+    elif isinstance(node, dict):
+        if not node:
+            out.append("{}")
+            return
+        if indent is None:
+            out.append("{")
+            for i, (k, v) in enumerate(node.items()):
+                if i:
+                    out.append(",")
+                out.append(jq_string(k))
+                out.append(":")
+                _dump(v, out, indent, level)
+            out.append("}")
+        else:
+            pad = "\n" + " " * (indent * (level + 1))
+            out.append("{")
+            for i, (k, v) in enumerate(node.items()):
+                out.append("," + pad if i else pad)
+                out.append(jq_string(k))
+                out.append(": ")
+                _dump(v, out, indent, level + 1)
+            out.append("\n" + " " * (indent * level) + "}")
+    elif isinstance(node, list):
+        if not node:
+            out.append("[]")
+            return
+        if indent is None:
+            out.append("[")
+            for i, v in enumerate(node):
+                if i:
+                    out.append(",")
+                _dump(v, out, indent, level)
+            out.append("]")
+        else:
+            pad = "\n" + " " * (indent * (level + 1))
+            out.append("[")
+            for i, v in enumerate(node):
+                out.append("," + pad if i else pad)
+                _dump(v, out, indent, level + 1)
+            out.append("\n" + " " * (indent * level) + "]")
+    else:
+        raise TypeError(f"Not JSON serialisable: {type(node).__name__}")
+
+
+def dumps_jq(node, indent: Optional[int] = 2) -> str:
+    """ jq 1.6 output of a parsed document: `jq .` (indent=2) or `jq -c .` (indent=None), without the trailing newline. """
+    out: List[str] = []
+    _dump(node, out, indent, 0)
+    return "".join(out)
+
+
+def loads_jq(raw: bytes):
+    """
+    Parse one JSON document as jq reads it: invalid UTF-8 becomes U+FFFD.
+    Numbers are kept as int/float; jq_number() applies jq's double semantics.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # Invalid UTF-8 or integers beyond 64 bits; the stdlib handles both
+            pass
+    return json.loads(raw.decode("utf-8", errors="replace"))
+
+
+REDACTED_SPLIT_PATH = "<REDACTED_SPLIT_PATH>"
+REDACTED_TABLE_LOCATION = "<REDACTED_TABLE_LOCATION>"
+_DROPPED_KEYS = frozenset(("remoteUserAddress", "self"))
+_ISO_TS_RE = re.compile(r"^[0-9]{4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2}(\.[0-9]+)?(Z|[+-][0-9]{2}:[0-9]{2})?$")
+
+
+def _jq_type(node) -> str:
+    if node is None:
+        return "null"
+    if isinstance(node, bool):
+        return "boolean"
+    if isinstance(node, (int, float)):
+        return "number"
+    return {str: "string", list: "array", dict: "object"}[type(node)]
+
+
+def _objects(node, after_step1: bool = False):
+    # Objects in node, pre-order; after_step1 skips splitInfo.path values, which step 1 has replaced
+    if isinstance(node, dict):
+        yield node
+        for k, v in node.items():
+            if after_step1 and k == "splitInfo" and isinstance(v, dict):
+                v = {kk: vv for kk, vv in v.items() if kk != "path"}
+            yield from _objects(v, after_step1)
+    elif isinstance(node, list):
+        for v in node:
+            yield from _objects(v, after_step1)
+
+
+def _has_split_path(obj) -> bool:
+    return isinstance(obj.get("splitInfo"), dict) and "path" in obj["splitInfo"]
+
+
+def _check_skipped(value, replaced_key: Optional[str] = None) -> None:
+    """
+    Raise the errors scrub.jq hits inside a subtree this pass removes or
+    replaces without visiting: a non-object splitInfo (step 1), or a value
+    replaced by step 1 or 2 that holds a path the same step assigns into.
+    """
+    if not isinstance(value, (dict, list)):
+        return
+    if replaced_key == "path" and any(_has_split_path(o) for o in _objects(value)):
+        raise ValueError("Cannot index string with \"splitInfo\"")
+    if replaced_key == "tableLocation" and any("tableLocation" in o for o in _objects(value, after_step1=True)):
+        raise ValueError("Cannot index string with \"tableLocation\"")
+    for obj in _objects(value):
+        if "splitInfo" in obj and not isinstance(obj["splitInfo"], dict):
+            raise ValueError(f"Cannot check whether {_jq_type(obj['splitInfo'])} has a string key")
+        if _has_split_path(obj):
+            _check_skipped(obj["splitInfo"]["path"], "path")
+    if replaced_key == "path":
+        return
+    for obj in _objects(value, after_step1=True):
+        if "tableLocation" in obj:
+            _check_skipped(obj["tableLocation"], "tableLocation")
+
+
+def scrub_document(node, _redact_path: bool = False):
+    """
+    scrub.jq in one recursive pass, applied in the filter's order per object:
+      1) splitInfo.path           -> "<REDACTED_SPLIT_PATH>"
+      2) tableLocation            -> "<REDACTED_TABLE_LOCATION>"
+      3/4) remoteUserAddress, self keys removed
+      5) object entries whose value is an ISO-8601 timestamp string removed
+    """
+    if isinstance(node, dict):
+        out = {}
+        for key, value in node.items():
+            if key in _DROPPED_KEYS:
+                _check_skipped(value)
+                continue
+            if _redact_path and key == "path":
+                _check_skipped(value, "path")
+                value = REDACTED_SPLIT_PATH
+            elif key == "tableLocation":
+                _check_skipped(value, "tableLocation")
+                value = REDACTED_TABLE_LOCATION
+            elif key == "splitInfo":
+                if not isinstance(value, dict):
+                    # `has("path")` on a non-object is a jq error, as in scrub.jq
+                    raise ValueError(f"Cannot check whether {_jq_type(value)} has a string key")
+                value = scrub_document(value, _redact_path=True)
+            else:
+                value = scrub_document(value)
+
+            if isinstance(value, str) and _ISO_TS_RE.match(value):
+                continue
+            out[key] = value
+        return out
+    if isinstance(node, list):
+        return [scrub_document(v) for v in node]
+    return node
+
+
+_DUR_PLAIN_RE = re.compile(r"^[0-9]+(\.[0-9]+)?$")
+_DUR_UNIT_RES = [
+    (re.compile(r"^[0-9]+(\.[0-9]+)?s$"), re.compile(r"s$"), lambda v: v),
+    (re.compile(r"^[0-9]+(\.[0-9]+)?ms$"), re.compile(r"ms$"), lambda v: v / 1000),
+    (re.compile(r"^[0-9]+(\.[0-9]+)?(us|µs)$"), re.compile(r"(us|µs)$"), lambda v: v / 1000000),
+    (re.compile(r"^[0-9]+(\.[0-9]+)?ns$"), re.compile(r"ns$"), lambda v: v / 1000000000),
+    (re.compile(r"^[0-9]+(\.[0-9]+)?m$"), re.compile(r"m$"), lambda v: v * 60),
+    (re.compile(r"^[0-9]+(\.[0-9]+)?h$"), re.compile(r"h$"), lambda v: v * 3600),
+]
+
+
+def dur_to_seconds(d):
+    """ dur_to_seconds from make_lakehouse_workload_logs.sh. """
+    if d is None:
+        return None
+    if isinstance(d, (int, float)) and not isinstance(d, bool):
+        return d
+    if not isinstance(d, str):
+        return None
+    if _DUR_PLAIN_RE.match(d):
+        return float(d)
+    for test_re, suffix_re, scale in _DUR_UNIT_RES:
+        if test_re.match(d):
+            return scale(float(suffix_re.sub("", d, count=1)))
+    return None
+
+
+def workload_log_line(doc, query_id: str) -> str:
+    """ The `jq -c` line make_lakehouse_workload_logs.sh writes for one query document. """
+    if doc is not None and not isinstance(doc, dict):
+        raise ValueError(f"Cannot index {_jq_type(doc)} with \"queryStats\"")
+    qs = doc.get("queryStats") if doc is not None else None
+    if qs is not None and not isinstance(qs, dict):
+        raise ValueError(f"Cannot index {_jq_type(qs)} with \"elapsedTime\"")
+    qs = qs or {}
+
+    def num(key):
+        v = dur_to_seconds(qs.get(key))
+        return "-1" if v is None else jq_number(v)
+
+    elapsed = num("elapsedTime")
+    return (
+        '{"query_id":' + jq_string(query_id)
+        + ',"Runtime (s)":' + elapsed
+        + ',"elapsed_s":' + elapsed
+        + ',"execution_s":' + num("executionTime")
+        + ',"planning_s":' + num("analysisTime")
+        + ',"resource_waiting_s":' + num("resourceWaitingTime")
+        + "}"
+    )
+
+
+def reduce_file(path: str, scrub: bool, query_id: Optional[str]) -> Optional[str]:
+    """
+    Read `path` once; optionally rewrite it scrubbed (as `jq -f scrub.jq`),
+    and return its workload log line when `query_id` is given.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+
+    # jq writes nothing for an empty input
+    doc = loads_jq(raw) if raw.strip() else None
+
+    if scrub:
+        if doc is not None:
+            doc = scrub_document(doc)
+        text = "" if doc is None else dumps_jq(doc) + "\n"
+        tmp = f"{path}.tmp.{os.getpid()}"
+        with open(tmp, "wb") as f:
+            f.write(text.encode("utf-8"))
+        os.replace(tmp, path)
+
+    if query_id is None or doc is None:
+        return None
+    return workload_log_line(doc, query_id)
+
+
+def _subdirs(path: str) -> List[str]:
+    return sorted(e.path for e in os.scandir(path) if e.is_dir(follow_symlinks=False))
+
+
+def _files(path: str) -> List[str]:
+    return sorted(e.path for e in os.scandir(path) if e.is_file(follow_symlinks=False))
+
+
+def _version_key(name: str):
+    # `sort -V` for q<N>.json names
+    return [int(t) if t.isdigit() else t for t in re.split(r"(\d+)", name)]
+
+
+_LAKEHOUSE_RE = re.compile(r"^lakehouse_([^_]+)_([0-9]+)$")
+
+
+def scrub_targets(root: str) -> List[str]:
+    """ Files scrub_lakehouse_traces.sh scrubs: <root>/<type>/lakehouse_*_[0-9]*/*.json. """
+    targets = []
+    for type_dir in _subdirs(root):
+        for lh_dir in _subdirs(type_dir):
+            if not fnmatch.fnmatchcase(os.path.basename(lh_dir), "lakehouse_*_[0-9]*"):
+                continue
+            for f in _files(lh_dir):
+                name = os.path.basename(f)
+                if fnmatch.fnmatchcase(name, "*.json") and not name.endswith(".scrubbed.json") and not name.endswith(".ndjson"):
+                    targets.append(f)
+    return targets
+
+
+def summary_targets(root: str) -> Dict[str, List[Tuple[str, str]]]:
+    """
+    {Workload_log_<TOKEN>_<RUN>.ndjson path: [(q*.json path, query id), ...]}
+    as make_lakehouse_workload_logs.sh builds them.
+    """
+    if any(fnmatch.fnmatchcase(name, "lakehouse_*_*") for name in os.listdir(root)):
+        type_dirs = [root]
+    else:
+        type_dirs = _subdirs(root)
+
+    logs = {}
+    for type_dir in type_dirs:
+        for lh_dir in _subdirs(type_dir):
+            m = _LAKEHOUSE_RE.match(os.path.basename(lh_dir))
+            if not m:
+                continue
+            out_file = os.path.join(type_dir, f"Workload_log_{m.group(1)}_{m.group(2)}.ndjson")
+            qfiles = [f for f in _files(lh_dir) if fnmatch.fnmatchcase(os.path.basename(f), "q*.json")]
+            qfiles.sort(key=_version_key)
+            logs[out_file] = [(f, os.path.basename(f)[: -len(".json")]) for f in qfiles]
+    return logs
+
+
+def _reduce_task(task):
+    path, scrub, query_id = task
+    return path, reduce_file(path, scrub, query_id)
+
+
+def reduce_traces(root: str, *, scrub: bool = True, summary: bool = True,
+                  dry_run: bool = False, workers: Optional[int] = None) -> None:
+    """
+    Scrub and/or summarise every trace under `root` (a cluster or type dir),
+    one task per file across a process pool. With both steps, each file is
+    summarised from its scrubbed document in the same pass, as running the
+    scrub then the summary script would.
+    """
+    to_scrub = scrub_targets(root) if scrub else []
+    logs = summary_targets(root) if summary else {}
+
+    query_ids = {path: qid for entries in logs.values() for path, qid in entries}
+    scrub_set = set(to_scrub)
+    tasks = [(p, True, query_ids.get(p)) for p in to_scrub]
+    tasks += [(p, False, qid) for p, qid in query_ids.items() if p not in scrub_set]
+
+    if dry_run:
+        for p in to_scrub:
+            print(f"DRY_RUN would scrub: {p}")
+        for out_file, entries in logs.items():
+            print(f"DRY_RUN: would write -> {out_file} from {len(entries)} q*.json files")
+        return
+
+    if workers == 1:
+        lines = dict(map(_reduce_task, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            lines = dict(pool.map(_reduce_task, tasks, chunksize=8))
+
+    if to_scrub:
+        print(f"Scrubbed {len(to_scrub)} files")
+    for out_file, entries in logs.items():
+        body = "".join(lines[p] + "\n" for p, _ in entries if lines.get(p) is not None)
+        with open(out_file, "w", encoding="utf-8") as f:
+            f.write(body)
+        print(f"Building {out_file} -> wrote {body.count(chr(10))} lines")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrub and summarise lakehouse traces (jq-compatible output).")
+    parser.add_argument("root", help="Cluster or type directory")
+    parser.add_argument("dry_run", nargs="?", default="1", choices=["0", "1"])
+    parser.add_argument("--scrub", action="store_true")
+    parser.add_argument("--summary", action="store_true")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.root):
+        parser.error(f"root dir not found: {args.root}")
+
+    # No step flag: both, like running the scrub and summary steps in turn
+    do_scrub = args.scrub or not (args.scrub or args.summary)
+    do_summary = args.summary or not (args.scrub or args.summary)
+    reduce_traces(args.root, scrub=do_scrub, summary=do_summary, dry_run=args.dry_run == "1", workers=args.workers)